@@ -104,14 +104,9 @@ class SystemManager:
             frame, frame_id, timestamp, return_annotated=True
         )
 
-        # Update history buffer
-        for detection in detections:
-            object_id = (
-                detection.track_id
-                if detection.track_id is not None
-                else detection.frame_id
-            )
-            self.history_buffer.add_detection(object_id, detection)
+        # Update history buffer, keyed by each detection's object_id as the
+        # safety monitor expects
+        self.history_buffer.add_detections(detections)
 
         # Cleanup stale objects every 30 frames
         if frame_id % 30 == 0:
@@ -32,6 +32,27 @@ class HistoryBuffer:
             self.tracked_objects[object_id].add_detection(detection_point)
             self.frame_count = max(self.frame_count, detection_point.frame_id)
 
+    def add_detections(self, detections: List[DetectionPoint]):
+        """Add a frame's detections under one lock, keyed by their object_id."""
+        if not detections:
+            return
+
+        with self.lock:
+            tracked_objects = self.tracked_objects
+            maxlen = self.maxlen
+            for detection_point in detections:
+                tracked_obj = tracked_objects.get(detection_point.object_id)
+                if tracked_obj is None:
+                    tracked_obj = TrackedObject(
+                        detection_point.object_id, maxlen=maxlen
+                    )
+                    tracked_objects[detection_point.object_id] = tracked_obj
+                tracked_obj.add_detection(detection_point)
+
+            self.frame_count = max(
+                self.frame_count, max(d.frame_id for d in detections)
+            )
+
     def get_trajectory(
         self, object_id: int, frames_back: Optional[int] = None
     ) -> List[DetectionPoint]:
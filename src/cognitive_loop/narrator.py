@@ -1,14 +1,53 @@
 """LLM narrator for generating natural language descriptions."""
 
+import re
 import requests
 import json
 import logging
+import time
 from typing import List, Optional
 
-from src.config import OLLAMA_API_URL, OLLAMA_MODEL
+from src.config import (
+    OLLAMA_API_URL,
+    OLLAMA_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX,
+    OLLAMA_NUM_PREDICT,
+    OLLAMA_CONNECTION_TTL,
+    SCENE_CACHE_MAX_REUSE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Common follow-up patterns to strip from narration
+FOLLOW_UP_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in (
+        r"Is there anything else I can assist you with\?.*",
+        r"Let me know if you need.*",
+        r"Feel free to ask.*",
+        r"Would you like.*",
+        r"I can help.*",
+        r"Please let me know.*",
+    )
+]
+REPEATED_PERIODS = re.compile(r"\.{2,}")
+WHITESPACE_RUNS = re.compile(r"\s+")
+
+# Every fixed instruction goes in Ollama's "system" field, ahead of the changing
+# scene text, so the request prompt is just the Context and Entities lines.
+SYSTEM_PROMPT = """You are a helpful assistant for a blind user. Be concise and direct. Only describe what is certainly present. Do not ask questions.
+If the context mentions a "mirror" or "reflection" and it seems to be describing the user themselves (e.g., "standing in front of a mirror"), assume it is a hallucination caused by the camera feed and describe it as the person being present or facing the camera.
+
+TASK: Synthesize the context and entities into one natural sentence.
+IMPORTANT RULES:
+1. PRIORITIZE ENTITY COUNT: The "Entities" list contains accurate object detections from a computer vision system. If the Context says "two cars" but the Entities list shows 4 car entries, use the count from Entities (4 cars). The Entities list is more reliable for counting objects.
+2. MERGE SUBJECTS: When the same object type appears multiple times in Entities, count them separately (e.g., "car: Stationary" and "car: Approaching" = 2 cars). Only merge if the Context explicitly describes the same single object.
+3. If the context mentions a person holding an object, and that object also appears in the entities list, DO NOT describe the object as moving independently. It moves with the person.
+4. Small handheld objects moving in the same direction as a person are almost certainly held items, not independent threats.
+5. Prioritize safety information about truly independent moving objects (vehicles, other people, animals).
+6. Ignore any coordinates or bounding box numbers (e.g., "box (100, 200, ...)") mentioned in the entities list. They are technical data. If an entity is described as "at box", simply treat it as "present" or "in front of you". Do NOT say "at a box", "near a box", or "at the location"."""
+
 
 class LLMNarrator:
     """Generates narration using Llama 3.2 via Ollama."""
@@ -18,11 +57,16 @@ class LLMNarrator:
         self.api_url = api_url
         self.model = model
         self.api_endpoint = f"{api_url}/api/generate"
+        self._last_key: Optional[tuple] = None
+        self._last_narration: Optional[str] = None
+        self._reuse_count = 0
+        self._conn_ok = False
+        self._conn_checked_at = 0.0
 
     def compose_prompt(
         self, scene_description: str, object_movements: List[str]
     ) -> str:
-        """Compose prompt for LLM."""
+        """Compose the scene-specific prompt; the instructions live in SYSTEM_PROMPT."""
         # Format object movements
         if object_movements:
             entities_text = "\n".join(
@@ -31,22 +75,9 @@ class LLMNarrator:
         else:
             entities_text = "- No objects detected."
 
-        prompt = f"""SYSTEM: You are a helpful assistant for a blind user. Be concise and direct. Only describe what is certainly present. Do not ask questions.
-If the context mentions a "mirror" or "reflection" and it seems to be describing the user themselves (e.g., "standing in front of a mirror"), assume it is a hallucination caused by the camera feed and describe it as the person being present or facing the camera.
-
-USER:
-Context: "{scene_description}"
+        prompt = f"""Context: "{scene_description}"
 Entities (detected by object detection system):
-{entities_text}
-
-TASK: Synthesize the context and entities into one natural sentence.
-IMPORTANT RULES:
-1. PRIORITIZE ENTITY COUNT: The "Entities" list contains accurate object detections from a computer vision system. If the Context says "two cars" but the Entities list shows 4 car entries, use the count from Entities (4 cars). The Entities list is more reliable for counting objects.
-2. MERGE SUBJECTS: When the same object type appears multiple times in Entities, count them separately (e.g., "car: Stationary" and "car: Approaching" = 2 cars). Only merge if the Context explicitly describes the same single object.
-3. If the context mentions a person holding an object, and that object also appears in the entities list, DO NOT describe the object as moving independently. It moves with the person.
-4. Small handheld objects moving in the same direction as a person are almost certainly held items, not independent threats.
-5. Prioritize safety information about truly independent moving objects (vehicles, other people, animals).
-6. Ignore any coordinates or bounding box numbers (e.g., "box (100, 200, ...)") mentioned in the entities list. They are technical data. If an entity is described as "at box", simply treat it as "present" or "in front of you". Do NOT say "at a box", "near a box", or "at the location"."""
+{entities_text}"""
 
         return prompt
 
@@ -55,12 +86,16 @@ IMPORTANT RULES:
         try:
             payload = {
                 "model": self.model,
+                "system": SYSTEM_PROMPT,
                 "prompt": prompt,
                 "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE,
                 "options": {
                     "temperature": 0.3,
                     "top_p": 0.9,
-                    "num_predict": 100,
+                    "num_ctx": OLLAMA_NUM_CTX,
+                    "num_predict": OLLAMA_NUM_PREDICT,
+                    "stop": ["\n\n", "USER:", "SYSTEM:"],
                 },
             }
 
@@ -81,42 +116,43 @@ IMPORTANT RULES:
 
         except requests.exceptions.Timeout:
             logger.error(f"Ollama API timeout after {timeout}s")
+            self._conn_checked_at = 0.0
             return None
         except requests.exceptions.ConnectionError:
             logger.error(f"Failed to connect to Ollama at {self.api_url}")
+            self._conn_checked_at = 0.0
             return None
         except Exception as e:
             logger.error(f"Error generating narration: {e}")
+            self._conn_checked_at = 0.0
             return None
 
     def check_connection(self) -> bool:
-        """Check if Ollama is available."""
+        """Check if Ollama is available (result cached for OLLAMA_CONNECTION_TTL)."""
+        now = time.monotonic()
+        if (
+            self._conn_checked_at
+            and now - self._conn_checked_at < OLLAMA_CONNECTION_TTL
+        ):
+            return self._conn_ok
+
         try:
             response = requests.get(f"{self.api_url}/api/tags", timeout=2.0)
-            return response.status_code == 200
+            self._conn_ok = response.status_code == 200
         except Exception:
-            return False
+            self._conn_ok = False
+
+        self._conn_checked_at = now
+        return self._conn_ok
 
     def _clean_narration(self, narration: str) -> str:
         """Clean narration to remove follow-up questions and extra verbosity."""
-        # Remove common follow-up patterns
-        patterns_to_remove = [
-            r"Is there anything else I can assist you with\?.*",
-            r"Let me know if you need.*",
-            r"Feel free to ask.*",
-            r"Would you like.*",
-            r"I can help.*",
-            r"Please let me know.*",
-        ]
-
-        import re
-
         cleaned = narration
-        for pattern in patterns_to_remove:
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE | re.DOTALL)
+        for pattern in FOLLOW_UP_PATTERNS:
+            cleaned = pattern.sub("", cleaned)
 
-        cleaned = re.sub(r"\.{2,}", ".", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned)
+        cleaned = REPEATED_PERIODS.sub(".", cleaned)
+        cleaned = WHITESPACE_RUNS.sub(" ", cleaned)
         cleaned = cleaned.strip()
 
         if cleaned.endswith("?"):
@@ -132,5 +168,22 @@ IMPORTANT RULES:
         self, scene_description: str, object_movements: List[str]
     ) -> Optional[str]:
         """Generate narration from scene and movement components."""
+        key = (scene_description, tuple(object_movements))
+        if (
+            key == self._last_key
+            and self._last_narration
+            and self._reuse_count < SCENE_CACHE_MAX_REUSE
+        ):
+            self._reuse_count += 1
+            logger.debug("Scene and movements unchanged, reusing previous narration")
+            return self._last_narration
+
         prompt = self.compose_prompt(scene_description, object_movements)
-        return self.generate_narration(prompt)
+        narration = self.generate_narration(prompt)
+
+        if narration:
+            self._last_key = key
+            self._last_narration = narration
+            self._reuse_count = 0
+
+        return narration
@@ -1,16 +1,61 @@
 """BLIP scene captioning for scene understanding."""
 
+import re
 import torch
 from transformers import BlipProcessor, BlipForConditionalGeneration
 from PIL import Image
 import numpy as np
 import cv2
 import logging
+from typing import Optional
 
-from src.config import BLIP_MODEL_NAME
+from src.config import (
+    BLIP_MODEL_NAME,
+    BLIP_TORCH_COMPILE,
+    SCENE_HASH_MAX_DISTANCE,
+    SCENE_CACHE_MAX_REUSE,
+)
 
 logger = logging.getLogger(__name__)
 
+GENERATE_KWARGS = {
+    "max_length": 50,
+    "num_beams": 3,
+    "do_sample": False,
+    "repetition_penalty": 1.5,
+    "no_repeat_ngram_size": 2,
+}
+
+INAPPROPRIATE_RE = re.compile(r"\b(?:cock|penis|sex|nude|naked|explicit)\b")
+
+# Literal phrase fixups (BLIP captions are lowercase, sometimes capitalized)
+MIRROR_FIXUPS = [
+    ("in front of a mirror", "facing the camera"),
+    ("looking in a mirror", "looking at the camera"),
+    ("looking into a mirror", "looking at the camera"),
+    ("at a mirror", "at the camera"),
+]
+
+BATHROOM_FIXUPS = [
+    ("in a bathroom", "in a room"),
+    ("in the bathroom", "in the room"),
+]
+
+
+def _replace_phrases(text: str, fixups: list) -> str:
+    """Apply literal phrase replacements in lowercase and capitalized form."""
+    for old, new in fixups:
+        text = text.replace(old, new).replace(old.capitalize(), new.capitalize())
+    return text
+
+
+def _dhash(frame: np.ndarray) -> int:
+    """Compute a 64-bit difference hash of a BGR frame."""
+    small = cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = gray[:, 1:] > gray[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
 
 class SceneComposer:
     """Generates scene descriptions using BLIP."""
@@ -20,6 +65,10 @@ class SceneComposer:
         self.model_name = model_name
         self.processor = None
         self.model = None
+        self._last_hash: Optional[int] = None
+        self._last_caption: Optional[str] = None
+        self._cache_hits = 0
+        self._rgb_buf: Optional[np.ndarray] = None
         self._load_model()
 
     def _load_model(self):
@@ -42,122 +91,114 @@ class SceneComposer:
             self.model.to(self.device)
             self.model.eval()
 
+            if self.device == "cuda" and BLIP_TORCH_COMPILE:
+                self._compile_vision_model()
+
             logger.info(f"BLIP model loaded on {self.device}")
         except Exception as e:
             logger.error(f"Failed to load BLIP model: {e}")
             raise
 
+    def _compile_vision_model(self):
+        """Compile the vision encoder; camera frames always resize to one shape."""
+        eager_vision_model = self.model.vision_model
+        try:
+            self.model.vision_model = torch.compile(
+                eager_vision_model, mode="reduce-overhead", fullgraph=False
+            )
+
+            size = self.processor.image_processor.size
+            dummy = torch.zeros(1, 3, size["height"], size["width"], device=self.device)
+            with torch.no_grad():
+                self.model.generate(pixel_values=dummy, **GENERATE_KWARGS)
+
+            logger.info("BLIP vision encoder compiled (CUDA graphs)")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager BLIP encoder: {e}")
+            self.model.vision_model = eager_vision_model
+
     def generate_scene_description(self, frame: np.ndarray) -> str:
         """Generate scene description from frame."""
         if self.model is None or self.processor is None:
             logger.warning("BLIP model not loaded, returning default description")
             return "A scene with various objects."
 
+        frame_hash = _dhash(frame)
+        if self._is_unchanged(frame_hash):
+            self._cache_hits += 1
+            logger.debug("Scene unchanged, reusing previous caption")
+            return self._last_caption
+
         try:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
+            pil_image = self._to_pil(frame)
             inputs = self.processor(pil_image, return_tensors="pt").to(self.device)
 
             with torch.no_grad():
-                out = self.model.generate(
-                    **inputs,
-                    max_length=50,
-                    num_beams=3,
-                    do_sample=False,
-                    repetition_penalty=1.5,
-                    no_repeat_ngram_size=2,
-                )
+                out = self.model.generate(**inputs, **GENERATE_KWARGS)
 
             caption = self.processor.decode(out[0], skip_special_tokens=True)
             caption = self._sanitize_caption(caption)
 
+            self._last_hash = frame_hash
+            self._last_caption = caption
+            self._cache_hits = 0
+
             return caption
 
         except Exception as e:
             logger.error(f"Error generating scene description: {e}")
             return "Unable to describe scene."
 
+    def _to_pil(self, frame: np.ndarray) -> Image.Image:
+        """Convert a BGR frame to a PIL image via a reused RGB buffer."""
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        # fromarray copies RGB data, so the buffer can be reused immediately
+        return Image.fromarray(self._rgb_buf)
+
+    def _is_unchanged(self, frame_hash: int) -> bool:
+        """Check if a frame matches the last captioned frame closely enough to reuse."""
+        if self._last_hash is None or self._cache_hits >= SCENE_CACHE_MAX_REUSE:
+            return False
+        distance = bin(frame_hash ^ self._last_hash).count("1")
+        return distance <= SCENE_HASH_MAX_DISTANCE
+
     def _sanitize_caption(self, caption: str) -> str:
         """Sanitize BLIP caption to filter inappropriate or hallucinated content."""
-        import re
-
         caption_lower = caption.lower()
-
-        inappropriate_patterns = [
-            r"\bcock\b",
-            r"\bpenis\b",
-            r"\bsex\b",
-            r"\bnude\b",
-            r"\bnaked\b",
-            r"\bexplicit\b",
-        ]
+        dirty = False
 
         if "mirror" in caption_lower:
             logger.info(f"Correcting 'mirror' hallucination in caption: {caption}")
-            caption = re.sub(
-                r"in front of a mirror",
-                "facing the camera",
-                caption,
-                flags=re.IGNORECASE,
-            )
-            caption = re.sub(
-                r"looking in a mirror",
-                "looking at the camera",
-                caption,
-                flags=re.IGNORECASE,
-            )
-            caption = re.sub(
-                r"looking into a mirror",
-                "looking at the camera",
-                caption,
-                flags=re.IGNORECASE,
-            )
-            caption = re.sub(
-                r"at a mirror", "at the camera", caption, flags=re.IGNORECASE
-            )
-            if "mirror" in caption.lower():
-                caption = caption.replace("mirror", "camera")
-            caption_lower = caption.lower()
+            caption = _replace_phrases(caption, MIRROR_FIXUPS)
+            caption = caption.replace("mirror", "camera")
+            dirty = True
 
+        # Mirror fixups never touch "bathroom", so caption_lower is still valid here
         if "bathroom" in caption_lower:
             logger.info(f"Correcting 'bathroom' hallucination in caption: {caption}")
-            caption = re.sub(
-                r"in a bathroom", "in a room", caption, flags=re.IGNORECASE
-            )
-            caption = re.sub(
-                r"in the bathroom", "in the room", caption, flags=re.IGNORECASE
-            )
+            caption = _replace_phrases(caption, BATHROOM_FIXUPS)
             caption = caption.replace("bathroom", "room")
+            dirty = True
+
+        if dirty:
             caption_lower = caption.lower()
 
-        for pattern in inappropriate_patterns:
-            if re.search(pattern, caption_lower):
-                logger.warning(
-                    f"BLIP generated inappropriate caption, filtering: {caption[:50]}..."
-                )
-                safe_keywords = []
-                if "man" in caption_lower or "person" in caption_lower:
-                    safe_keywords.append("a person")
-                if "room" in caption_lower or "bathroom" in caption_lower:
-                    safe_keywords.append("in a room")
-                if "shirt" in caption_lower:
-                    safe_keywords.append("wearing a shirt")
-
-                if safe_keywords:
-                    return " ".join(safe_keywords) + "."
-                else:
-                    return "A person in a room."
-
-        suspicious_count = sum(
-            1 for pattern in inappropriate_patterns if re.search(pattern, caption_lower)
-        )
-
-        if suspicious_count > 0:
+        if INAPPROPRIATE_RE.search(caption_lower):
             logger.warning(
-                f"BLIP caption contains inappropriate content, sanitizing: {caption}"
+                f"BLIP generated inappropriate caption, filtering: {caption[:50]}..."
             )
-            if "person" in caption_lower or "man" in caption_lower:
-                return "A person in the scene."
-            return "A scene with various objects."
+            safe_keywords = []
+            if "man" in caption_lower or "person" in caption_lower:
+                safe_keywords.append("a person")
+            if "room" in caption_lower:
+                safe_keywords.append("in a room")
+            if "shirt" in caption_lower:
+                safe_keywords.append("wearing a shirt")
+
+            if safe_keywords:
+                return " ".join(safe_keywords) + "."
+            return "A person in a room."
 
         return caption
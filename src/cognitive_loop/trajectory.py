@@ -1,71 +1,132 @@
 """Trajectory analysis for movement classification."""
 
+from functools import lru_cache, partial
 from typing import List, Optional
+import numpy as np
 import logging
 
-from src.utils.data_structures import TrackedObject, DetectionPoint
+from src.utils.data_structures import (
+    TrackedObject,
+    DetectionPoint,
+    HANDHELD_CLASS_SET,
+)
 from src.reflex_loop.physics import PhysicsEngine
 
 logger = logging.getLogger(__name__)
 
+__all__ = ["TrajectoryAnalyzer"]
+
+# Movement type codes
+STATIONARY, APPROACHING, LEAVING, PASSING = 0, 1, 2, 3
+
+# Description templates indexed by movement code; PASSING is built from PASSING_DIRECTIONS
+DESCRIPTION_TEMPLATES = ("%s: Stationary", "%s: Approaching", "%s: Leaving", None)
+
+# Indexed as [is_vertical][is_positive_delta]
+PASSING_DIRECTIONS = (
+    ("right to left", "left to right"),
+    ("bottom to top", "top to bottom"),
+)
+
+# (velocity_threshold, area_threshold) for normal and camera-shake frames
+DEFAULT_THRESHOLDS = (5.0, 25.0)
+SHAKE_THRESHOLDS = (8.0, 35.0)
+
+
+def _classify_movement_code(
+    delta_x: float,
+    delta_y: float,
+    area_growth: float,
+    velocity_threshold: float,
+    area_threshold: float,
+) -> int:
+    """Classify movement from plain floats, returning a movement type code."""
+    speed_sq = delta_x * delta_x + delta_y * delta_y
+    if (
+        speed_sq < velocity_threshold * velocity_threshold
+        and abs(area_growth) < area_threshold
+    ):
+        return STATIONARY
+
+    if area_growth > area_threshold:
+        return APPROACHING
+
+    if area_growth < -area_threshold:
+        return LEAVING
+
+    return PASSING
+
+
+def _alignment_ratio(vectors: np.ndarray) -> float:
+    """Fraction of moving (N, 2) velocity vectors within ~45 degrees of their mean."""
+    speed_sq = (vectors * vectors).sum(axis=1)
+    moving = speed_sq > 1.0
+    if np.count_nonzero(moving) < 2:
+        return 0.0
+
+    vectors = vectors[moving]
+    mags = np.sqrt(speed_sq[moving])
+    avg = vectors.mean(axis=0)
+    mag_avg = float(np.linalg.norm(avg))
+    if mag_avg == 0:
+        return 0.0
+
+    # cos > 0.7  <=>  dot > 0.7 * |v| * |avg|, since both norms are positive
+    aligned = np.count_nonzero((vectors @ avg) > 0.7 * mag_avg * mags)
+    return aligned / len(vectors)
+
+
+@lru_cache(maxsize=512)
+def _describe(class_name: str, movement_type: int, variant: int) -> str:
+    """Build (and memoize) a description; variant is the rapid flag or direction index."""
+    if movement_type == APPROACHING and variant:
+        return "%s: Approaching rapidly" % class_name
+
+    template = DESCRIPTION_TEMPLATES[movement_type]
+    if template is not None:
+        return template % class_name
+
+    direction = PASSING_DIRECTIONS[variant >> 1][variant & 1]
+    return "%s: Moving %s (passing by)" % (class_name, direction)
+
 
 class TrajectoryAnalyzer:
     """Analyzes object movement trajectories."""
 
-    HANDHELD_CLASSES = {
-        "cell phone",
-        "mobile phone",
-        "remote",
-        "tv remote",
-        "remote control",
-        "keyboard",
-        "mouse",
-        "cup",
-        "bottle",
-        "glass",
-        "wine glass",
-        "book",
-        "toothbrush",
-        "scissors",
-        "hair dryer",
-        "hairbrush",
-        "fork",
-        "knife",
-        "spoon",
-    }
+    # Fewer objects with velocity history than this is too little evidence for shake
+    MIN_OBJECTS_FOR_SHAKE = 4
+
+    # Kept on the class for callers that filter narration text by handheld class
+    HANDHELD_CLASSES = HANDHELD_CLASS_SET
 
     def __init__(self):
         """Initialize trajectory analyzer."""
         self.physics_engine = PhysicsEngine()
+        # object_id -> (tracked_obj, (last_seen, num_detections), (dx, dy, area_growth))
+        self._feature_cache: dict = {}
+        # Classifiers with the threshold pairs bound once
+        self._classify_default = partial(
+            _classify_movement_code,
+            velocity_threshold=DEFAULT_THRESHOLDS[0],
+            area_threshold=DEFAULT_THRESHOLDS[1],
+        )
+        self._classify_shake = partial(
+            _classify_movement_code,
+            velocity_threshold=SHAKE_THRESHOLDS[0],
+            area_threshold=SHAKE_THRESHOLDS[1],
+        )
 
     def analyze_movement(
         self, tracked_object: TrackedObject, filter_shake: bool = False
     ) -> str:
         """Analyze movement and return description."""
-        history = tracked_object.get_trajectory()
-
-        if len(history) < 5:
+        if tracked_object.num_detections < 5:
             return "Stationary"
 
-        delta_x, delta_y = self.physics_engine.calculate_velocity(tracked_object)
-        area_growth = self.physics_engine.calculate_area_growth(tracked_object)
-
-        if filter_shake:
-            movement_type = self._classify_movement(
-                delta_x,
-                delta_y,
-                area_growth,
-                velocity_threshold=8.0,
-                area_threshold=35.0,
-            )
-        else:
-            movement_type = self._classify_movement(
-                delta_x,
-                delta_y,
-                area_growth,
-                velocity_threshold=5.0,
-                area_threshold=25.0,
-            )
+        delta_x, delta_y, area_growth = self._get_features(tracked_object)
+
+        classify = self._classify_shake if filter_shake else self._classify_default
+        movement_type = classify(delta_x, delta_y, area_growth)
 
         description = self._format_description(
             tracked_object, delta_x, delta_y, area_growth, movement_type
@@ -73,176 +134,206 @@ class TrajectoryAnalyzer:
 
         return description
 
-    def _classify_movement(
-        self,
-        delta_x: float,
-        delta_y: float,
-        area_growth: float,
-        velocity_threshold: float = 2.0,
-        area_threshold: float = 10.0,
-    ) -> str:
-        """Classify movement type."""
-        speed = (delta_x**2 + delta_y**2) ** 0.5
-        if speed < velocity_threshold and abs(area_growth) < area_threshold:
-            return "Stationary"
-
-        if area_growth > area_threshold:
-            return "Approaching"
-
-        if area_growth < -area_threshold:
-            return "Leaving"
-
-        return "Passing By"
-
     def _format_description(
         self,
         tracked_object: TrackedObject,
         delta_x: float,
         delta_y: float,
         area_growth: float,
-        movement_type: str,
+        movement_type: int,
     ) -> str:
         """Format movement description (without IDs for natural language)."""
         class_name = tracked_object.class_name or "Object"
 
-        if movement_type == "Stationary":
-            return f"{class_name}: Stationary"
-
-        elif movement_type == "Approaching":
-            if abs(area_growth) > 60:
-                return f"{class_name}: Approaching rapidly"
-            else:
-                return f"{class_name}: Approaching"
-
-        elif movement_type == "Leaving":
-            return f"{class_name}: Leaving"
-
+        if movement_type == APPROACHING:
+            variant = int(abs(area_growth) > 60)
+        elif movement_type == PASSING:
+            vertical = abs(delta_x) <= abs(delta_y)
+            positive = (delta_y if vertical else delta_x) > 0
+            variant = 2 * int(vertical) + int(positive)
         else:
-            if abs(delta_x) > abs(delta_y):
-                direction = "left to right" if delta_x > 0 else "right to left"
-            else:
-                direction = "top to bottom" if delta_y > 0 else "bottom to top"
+            variant = 0
 
-            return f"{class_name}: Moving {direction} (passing by)"
+        return _describe(class_name, movement_type, variant)
 
     def _detect_camera_shake(self, tracked_objects: dict) -> bool:
         """Detect if camera shake is causing false movement detections."""
-        if len(tracked_objects) < 2:
+        if len(tracked_objects) < self.MIN_OBJECTS_FOR_SHAKE:
             return False
 
-        velocities = []
-        for obj_id, tracked_obj in tracked_objects.items():
-            history = tracked_obj.get_trajectory()
-            if len(history) < 2:
-                continue
-
-            delta_x, delta_y = self.physics_engine.calculate_velocity(tracked_obj)
-            speed = (delta_x**2 + delta_y**2) ** 0.5
-
-            if speed > 1.0:
-                velocities.append((delta_x, delta_y))
-
-        if len(velocities) < 2:
+        candidates = [
+            tracked_obj
+            for tracked_obj in tracked_objects.values()
+            if tracked_obj.num_detections >= 2
+        ]
+        if len(candidates) < self.MIN_OBJECTS_FOR_SHAKE:
             return False
 
-        avg_delta_x = sum(v[0] for v in velocities) / len(velocities)
-        avg_delta_y = sum(v[1] for v in velocities) / len(velocities)
-
-        aligned_count = 0
-        for vx, vy in velocities:
-            dot_product = vx * avg_delta_x + vy * avg_delta_y
-            mag_v = (vx**2 + vy**2) ** 0.5
-            mag_avg = (avg_delta_x**2 + avg_delta_y**2) ** 0.5
-
-            if mag_v > 0 and mag_avg > 0:
-                similarity = dot_product / (mag_v * mag_avg)
-                if similarity > 0.7:
-                    aligned_count += 1
-
-        alignment_ratio = aligned_count / len(velocities)
-        return alignment_ratio > 0.7
+        velocities = [self._get_features(tracked_obj)[:2] for tracked_obj in candidates]
+        vectors = np.array(velocities, dtype=np.float32)
+        return _alignment_ratio(vectors) > 0.7
 
     def analyze_all_objects(self, tracked_objects: dict) -> List[str]:
         """Analyze all tracked objects, filtering out camera shake."""
+        tracked_objects = {
+            obj_id: obj
+            for obj_id, obj in tracked_objects.items()
+            if obj is not None and obj.num_detections > 0
+        }
+        for stale_id in self._feature_cache.keys() - tracked_objects.keys():
+            del self._feature_cache[stale_id]
+
         is_camera_shake = self._detect_camera_shake(tracked_objects)
 
         if is_camera_shake:
             logger.debug("Camera shake detected - filtering out false movements")
 
-        person_objects = [
-            obj
-            for obj in tracked_objects.values()
-            if (obj.class_name or "").lower() == "person"
-        ]
+        has_handheld = any(obj.is_handheld for obj in tracked_objects.values())
+        if has_handheld:
+            objects = self._filter_handheld(tracked_objects)
+        else:
+            objects = list(tracked_objects.items())
+
+        delta_x, delta_y, area_growth, short_history = self._batch_compute(objects)
+
+        velocity_threshold, area_threshold = (
+            SHAKE_THRESHOLDS if is_camera_shake else DEFAULT_THRESHOLDS
+        )
+        movement_codes = self.classify_batch(
+            delta_x, delta_y, area_growth, velocity_threshold, area_threshold
+        )
+        movement_codes[short_history] = STATIONARY
+        movement_codes = movement_codes.tolist()
 
         descriptions = []
-        for obj_id, tracked_obj in tracked_objects.items():
-            try:
-                if self._should_skip_handheld(tracked_obj, person_objects):
-                    logger.debug(
-                        "Skipping handheld object near person: %s",
-                        tracked_obj.class_name,
+        for i, (obj_id, tracked_obj) in enumerate(objects):
+            code = movement_codes[i]
+            if is_camera_shake and code != STATIONARY:
+                continue
+            if short_history[i]:
+                descriptions.append("Stationary")
+            else:
+                descriptions.append(
+                    self._format_description(
+                        tracked_obj, delta_x[i], delta_y[i], area_growth[i], code
                     )
-                    continue
-                description = self.analyze_movement(
-                    tracked_obj, filter_shake=is_camera_shake
                 )
-                if not is_camera_shake or "Stationary" in description:
-                    descriptions.append(description)
-            except Exception as e:
-                logger.error(f"Error analyzing object {obj_id}: {e}")
 
         return descriptions
 
+    @staticmethod
+    def classify_batch(
+        delta_x: np.ndarray,
+        delta_y: np.ndarray,
+        area_growth: np.ndarray,
+        velocity_threshold: float,
+        area_threshold: float,
+    ) -> np.ndarray:
+        """Classify many objects at once, returning an array of movement codes."""
+        speed_sq = delta_x * delta_x + delta_y * delta_y
+        stationary = (speed_sq < velocity_threshold * velocity_threshold) & (
+            np.abs(area_growth) < area_threshold
+        )
+        return np.select(
+            [stationary, area_growth > area_threshold, area_growth < -area_threshold],
+            [STATIONARY, APPROACHING, LEAVING],
+            default=PASSING,
+        )
+
+    def _filter_handheld(self, tracked_objects: dict) -> list:
+        """Drop handheld objects held by a person, keeping (obj_id, obj) pairs."""
+        person_boxes, person_areas = self._person_box_arrays(tracked_objects)
+
+        objects = []
+        for obj_id, tracked_obj in tracked_objects.items():
+            if self._should_skip_handheld(tracked_obj, person_boxes, person_areas):
+                logger.debug(
+                    "Skipping handheld object near person: %s",
+                    tracked_obj.class_name,
+                )
+                continue
+            objects.append((obj_id, tracked_obj))
+        return objects
+
+    def _batch_compute(self, objects: list) -> tuple:
+        """Gather movement features for all objects into struct-of-arrays form."""
+        count = len(objects)
+        delta_x = np.zeros(count)
+        delta_y = np.zeros(count)
+        area_growth = np.zeros(count)
+        short_history = np.zeros(count, dtype=bool)
+
+        for i, (obj_id, tracked_obj) in enumerate(objects):
+            if tracked_obj.num_detections < 5:
+                short_history[i] = True
+                continue
+            delta_x[i], delta_y[i], area_growth[i] = self._get_features(tracked_obj)
+
+        return delta_x, delta_y, area_growth, short_history
+
+    def _get_features(self, tracked_obj: TrackedObject) -> tuple:
+        """Return (dx, dy, area_growth), recomputed only when the object has new detections."""
+        tag = (tracked_obj.last_seen, tracked_obj.num_detections)
+        cached = self._feature_cache.get(tracked_obj.object_id)
+        if cached is not None and cached[0] is tracked_obj and cached[1] == tag:
+            return cached[2]
+
+        features = self.physics_engine.calculate_velocity_and_area(tracked_obj)
+        self._feature_cache[tracked_obj.object_id] = (tracked_obj, tag, features)
+        return features
+
+    @staticmethod
+    def _person_box_arrays(tracked_objects: dict) -> tuple:
+        """Stack the latest person boxes into (P, 4) boxes and (P,) areas arrays."""
+        boxes = []
+        for obj in tracked_objects.values():
+            if obj.class_name_lower != "person":
+                continue
+            latest = obj.get_latest()
+            if latest is not None:
+                boxes.append(latest.box)
+
+        person_boxes = np.array(boxes, dtype=np.float32).reshape(-1, 4)
+        widths = person_boxes[:, 2] - person_boxes[:, 0]
+        heights = person_boxes[:, 3] - person_boxes[:, 1]
+        person_areas = np.maximum(1.0, widths * heights)
+        return person_boxes, person_areas
+
     def _should_skip_handheld(
-        self, tracked_obj: TrackedObject, person_objects: List[TrackedObject]
+        self,
+        tracked_obj: TrackedObject,
+        person_boxes: np.ndarray,
+        person_areas: np.ndarray,
     ) -> bool:
         """Determine if a handheld object should be skipped because it's inside a person box."""
-        class_name = (tracked_obj.class_name or "").lower()
-        if class_name not in self.HANDHELD_CLASSES or not person_objects:
+        if not tracked_obj.is_handheld or len(person_boxes) == 0:
             return False
 
         latest = tracked_obj.get_latest()
         if latest is None:
             return True
 
-        for person in person_objects:
-            person_latest = person.get_latest()
-            if not person_latest:
-                continue
-
-            if self._point_inside_box(latest.center, person_latest.box):
-                return True
-
-            if self._overlap_ratio(latest.box, person_latest.box) > 0.5:
-                return True
-
-        return False
+        x, y = latest.center
+        inside = (
+            (person_boxes[:, 0] <= x)
+            & (x <= person_boxes[:, 2])
+            & (person_boxes[:, 1] <= y)
+            & (y <= person_boxes[:, 3])
+        )
+        if inside.any():
+            return True
 
-    @staticmethod
-    def _point_inside_box(point: tuple, box: tuple) -> bool:
-        """Check if a point lies inside a bounding box."""
-        x, y = point
-        x1, y1, x2, y2 = box
-        return x1 <= x <= x2 and y1 <= y <= y2
+        overlaps = self._overlap_ratios(latest.box, person_boxes, person_areas)
+        return bool((overlaps > 0.5).any())
 
     @staticmethod
-    def _overlap_ratio(box_a: tuple, box_b: tuple) -> float:
-        """Calculate overlap ratio of box_a inside box_b relative to the smaller box."""
-        ax1, ay1, ax2, ay2 = box_a
-        bx1, by1, bx2, by2 = box_b
+    def _overlap_ratios(box: tuple, boxes: np.ndarray, areas: np.ndarray) -> np.ndarray:
+        """Calculate overlap of box with each of boxes relative to the smaller box."""
+        ax1, ay1, ax2, ay2 = box
 
-        inter_x1 = max(ax1, bx1)
-        inter_y1 = max(ay1, by1)
-        inter_x2 = min(ax2, bx2)
-        inter_y2 = min(ay2, by2)
+        inter_w = np.minimum(ax2, boxes[:, 2]) - np.maximum(ax1, boxes[:, 0])
+        inter_h = np.minimum(ay2, boxes[:, 3]) - np.maximum(ay1, boxes[:, 1])
+        intersection = np.maximum(inter_w, 0) * np.maximum(inter_h, 0)
 
-        if inter_x1 >= inter_x2 or inter_y1 >= inter_y2:
-            return 0.0
-
-        intersection = (inter_x2 - inter_x1) * (inter_y2 - inter_y1)
         area_a = max(1, (ax2 - ax1) * (ay2 - ay1))
-        area_b = max(1, (bx2 - bx1) * (by2 - by1))
-        min_area = min(area_a, area_b)
-
-        return intersection / min_area
+        return intersection / np.minimum(area_a, areas)
@@ -9,24 +9,61 @@ EXPANSION_THRESHOLD = 0.4  # 40% growth triggers warning
 MIN_APPROACH_DISTANCE = 15.0  # pixels object center must move toward frame center
 EXPANSION_TIME_WINDOW = 1.5  # seconds for expansion check
 GLOBAL_WARNING_COOLDOWN = 5.0  # seconds between ANY warnings
+BEEP_SUPPRESS_AREA_RATIO = 0.4  # no beep once a hazard fills this much of the frame
 
 # Hazard Classes (COCO class names)
 HAZARD_CLASSES = ["car", "truck", "bus", "bicycle", "motorcycle", "person"]
 
+# Handheld Classes (ignored while inside a person's box)
+HANDHELD_CLASSES = [
+    "cell phone",
+    "mobile phone",
+    "remote",
+    "tv remote",
+    "remote control",
+    "keyboard",
+    "mouse",
+    "cup",
+    "bottle",
+    "glass",
+    "wine glass",
+    "book",
+    "toothbrush",
+    "scissors",
+    "hair dryer",
+    "hairbrush",
+    "fork",
+    "knife",
+    "spoon",
+]
+
 # Camera Configuration
 CAMERA_DEVICE_ID = 0  # 0 for default webcam, 1 for iPhone continuity camera
 CAMERA_FPS = 30
 CAMERA_WIDTH = 1280
 CAMERA_HEIGHT = 720
+OPENCV_THREADS = 2  # OpenCV worker threads, so decode doesn't oversubscribe cores
+CAMERA_RING_SIZE = 4  # preallocated frame slots the capture thread cycles through
+TEST_IMAGE_CACHE_MB = 256  # decoded test images kept in memory, at most
+FRAME_STORE_DIR = ".frame_cache"  # pre-decoded test image stores (git-ignored)
 
 # Model Paths
 YOLO_MODEL_PATH = "yolo11n.pt"
 YOLO_CONFIDENCE_THRESHOLD = 0.7
 BLIP_MODEL_NAME = "Salesforce/blip-image-captioning-base"
+BLIP_TORCH_COMPILE = True  # compile BLIP vision encoder on CUDA
+
+# Scene Stability Cache
+SCENE_HASH_MAX_DISTANCE = 4  # dHash bits that may differ for an "unchanged" frame
+SCENE_CACHE_MAX_REUSE = 60  # reuses before caption/narration are regenerated
 
 # Ollama Configuration
 OLLAMA_API_URL = "http://localhost:11434"
 OLLAMA_MODEL = "llama3.2:3b"
+OLLAMA_KEEP_ALIVE = "30m"  # keep model resident between narrations
+OLLAMA_NUM_CTX = 1024  # prompt is ~400 tokens; caps KV cache size
+OLLAMA_NUM_PREDICT = 100
+OLLAMA_CONNECTION_TTL = 5.0  # seconds to cache check_connection() result
 
 # Audio Configuration
 BEEP_FREQUENCY = 800  # Hz
@@ -34,9 +71,12 @@ BEEP_DURATION = 0.2  # seconds
 TTS_RATE = 220  # words per minute
 BEEP_COOLDOWN = 1.0  # seconds between beeps
 HAZARD_BEEP_COOLDOWN = 3.0  # seconds between hazard beeps
+SPEECH_QUEUE_SIZE = 16  # pending speech requests kept per priority level
+SPEECH_DEDUP_WINDOW = 2.0  # seconds to ignore a repeat of the last narration
 
 # Threading Configuration
 REFLEX_LOOP_FPS = 30
+DISPLAY_FPS = 15  # tracking window refresh rate; each refresh costs a cv2.waitKey
 COGNITIVE_LOOP_TIMEOUT = 2.0  # seconds
 
 # Logging
@@ -1,13 +1,32 @@
 """Audio output handler for beeps and TTS."""
 
 import queue
+import re
 import threading
 import time
 import logging
 import sys
 import os
+import shutil
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import IntEnum
+from typing import Optional
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # missing package or PortAudio library
+    sd = None
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
 
 from src.config import (
     BEEP_FREQUENCY,
@@ -15,10 +34,14 @@ from src.config import (
     TTS_RATE,
     BEEP_COOLDOWN,
     HAZARD_BEEP_COOLDOWN,
+    SPEECH_QUEUE_SIZE,
+    SPEECH_DEDUP_WINDOW,
 )
 
 logger = logging.getLogger(__name__)
 
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
 
 class SpeechPriority(IntEnum):
     """Priority levels for speech queue."""
@@ -27,7 +50,7 @@ class SpeechPriority(IntEnum):
     HIGH = 2  # Hazard warnings
 
 
-@dataclass(order=True)
+@dataclass
 class SpeechRequest:
     """Represents a speech request in the queue."""
 
@@ -43,31 +66,66 @@ class AudioHandler:
         """Initialize audio handler."""
         self.tts_engine = None
 
-        self.speech_queue = queue.PriorityQueue()
+        # One FIFO per priority level; the worker drains HIGH before LOW
+        self._high_speech = deque(maxlen=SPEECH_QUEUE_SIZE)
+        self._low_speech = deque(maxlen=SPEECH_QUEUE_SIZE)
+        self._speech_ready = threading.Event()
+
+        # Last LOW priority text and when it was queued, for dropping repeats
+        self._low_lock = threading.Lock()
+        self._last_low_text = ""
+        self._last_low_time = 0.0
+
+        # Speech that a HIGH priority request may cut off (barge-in)
+        self._active_proc = None
+        self._speaking_low = False
+
+        # On macOS the next request is synthesized to a file while the current
+        # one plays, hiding synthesis latency between utterances
+        self._synth_pool = None
+        self._prefetched = None  # (SpeechRequest, Future[Optional[str]])
+        self._phrase_cache = {}  # sentence -> Future[Optional[str]], kept for reuse
+        if sys.platform == "darwin":
+            self._synth_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tts-synth"
+            )
         self.speech_worker_thread = None
-        self.speech_worker_running = False
+        self._shutdown = threading.Event()
+
+        self.beep_queue = queue.Queue(maxsize=4)
+        self.beep_worker_thread = None
 
         self.audio_lock = threading.Lock()
-        self.last_beep_time = 0
+        self._beep_gate = threading.Lock()  # Makes the cooldown check-and-set atomic
+        self.last_beep_time = 0  # time.monotonic() of the last accepted beep
         self.beep_cooldown = BEEP_COOLDOWN
         self.last_hazard_beep_time = 0
         self.hazard_beep_cooldown = HAZARD_BEEP_COOLDOWN
+        self.beep_frequency = BEEP_FREQUENCY
+        self.beep_duration = BEEP_DURATION
+        self.tts_rate = TTS_RATE
         self.sounddevice_available = False
-        self.beep_playing = False
+        self._beep_done = threading.Event()
+        self._beep_done.set()
+        self.sample_rate = 44100
+        self._stream = None  # Output stream kept open for the handler's lifetime
+        # Tone being drained by the stream callback; guarded by audio_lock
+        self._tone = None
+        self._tone_pos = 0
+        self._beep_cache = {}  # (frequency, duration) -> read-only int16 wave
 
         self._init_tts()
         self._init_sounddevice()
         self._start_speech_worker()
+        self._start_beep_worker()
 
     def _init_piper_tts(self):
         """Initialize Piper TTS engine (fast, high quality, local)."""
         try:
-            import shutil
-
             piper_path = shutil.which("piper")
 
             if piper_path:
-                logger.info(f"Found Piper TTS executable at: {piper_path}")
+                logger.info("Found Piper TTS executable at: %s", piper_path)
                 self.use_piper = True
                 self.piper_path = piper_path
                 self.piper_model = "en_US-lessac-medium.onnx"
@@ -84,29 +142,27 @@ class AudioHandler:
                         "Piper TTS not found. Install with: pip install piper-tts or download binary"
                     )
         except Exception as e:
-            logger.warning(f"Failed to initialize Piper TTS: {e}")
+            logger.warning("Failed to initialize Piper TTS: %s", e)
             self.use_piper = False
 
     def _ensure_piper_model(self):
         """Ensure a Piper model is available."""
-        import os
-        import requests
-
         model_name = "en_US-lessac-medium.onnx"
         json_name = "en_US-lessac-medium.onnx.json"
 
         if not os.path.exists(model_name):
-            logger.info(f"Downloading Piper model: {model_name}...")
+            logger.info("Downloading Piper model: %s...", model_name)
             pass
 
     def _init_tts(self):
         """Initialize pyttsx3 TTS engine (fallback)."""
         try:
-            import pyttsx3
+            if pyttsx3 is None:
+                raise ImportError("No module named 'pyttsx3'")
 
             self.tts_engine = pyttsx3.init()
 
-            self.tts_engine.setProperty("rate", TTS_RATE)
+            self.tts_engine.setProperty("rate", self.tts_rate)
 
             voices = self.tts_engine.getProperty("voices")
             if len(voices) > 0:
@@ -133,114 +189,188 @@ class AudioHandler:
 
             logger.info("pyttsx3 TTS engine initialized (fallback)")
         except Exception as e:
-            logger.warning(f"Failed to initialize pyttsx3 TTS engine: {e}")
+            logger.warning("Failed to initialize pyttsx3 TTS engine: %s", e)
             self.tts_engine = None
 
     def _init_sounddevice(self):
         """Try to initialize sounddevice, fallback to system beep if unavailable."""
         try:
-            import sounddevice as sd
-            import numpy as np
+            if sd is None:
+                raise ImportError("No module named 'sounddevice'")
 
             test_wave = np.sin(2 * np.pi * 440 * np.linspace(0, 0.01, 441))
             sd.play(test_wave, samplerate=44100)
             sd.stop()
+            self._stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype="int16",
+                latency="low",
+                callback=self._fill_output,
+            )
+            self._stream.start()
+            self._get_tone(self.beep_frequency, self.beep_duration)
             self.sounddevice_available = True
             logger.info("sounddevice initialized successfully")
         except Exception as e:
             logger.warning(
-                f"sounddevice not available, using system beep fallback: {e}"
+                "sounddevice not available, using system beep fallback: %s", e
             )
             self.sounddevice_available = False
 
+    def _get_tone(self, frequency: int, duration: float):
+        """Return the cached waveform for a tone, generating it on first use."""
+        key = (frequency, duration)
+        wave = self._beep_cache.get(key)
+        if wave is None:
+            wave = self._make_tone(frequency, duration)
+            self._beep_cache[key] = wave
+        return wave
+
+    def _make_tone(self, frequency: int, duration: float):
+        """Generate a 16-bit PCM sine tone at the handler's sample rate."""
+        num_samples = int(self.sample_rate * duration)
+        # Phase in radians per sample, built and converted to sine in one buffer
+        wave = np.arange(num_samples, dtype=np.float32)
+        wave *= np.float32(2 * np.pi * frequency / self.sample_rate)
+        np.sin(wave, out=wave)
+        wave *= 32767
+        wave = wave.astype(np.int16)
+        wave.flags.writeable = False
+        return wave
+
+    @property
+    def beep_playing(self) -> bool:
+        """Whether a beep is currently being played."""
+        return not self._beep_done.is_set()
+
     def play_beep(
-        self, frequency: int = BEEP_FREQUENCY, duration: float = BEEP_DURATION
+        self, frequency: Optional[int] = None, duration: Optional[float] = None
     ):
-        """Play a beep sound for safety warnings."""
-        current_time = time.time()
-        if current_time - self.last_beep_time < self.beep_cooldown:
-            return
+        """Play a beep sound for safety warnings (defaults to the configured tone)."""
+        current_time = time.monotonic()
+        with self._beep_gate:
+            if current_time - self.last_beep_time < self.beep_cooldown:
+                return
 
-        if self.beep_playing:
-            logger.debug("Beep already playing, skipping")
-            return
+            if self.beep_playing:
+                logger.debug("Beep already playing, skipping")
+                return
 
-        self.last_beep_time = current_time
+            self.last_beep_time = current_time
 
-        def _beep():
-            """Generate and play beep in background thread."""
-            self.beep_playing = True
-            try:
-                if self.sounddevice_available:
-                    import sounddevice as sd
-                    import numpy as np
+        if frequency is None:
+            frequency = self.beep_frequency
+        if duration is None:
+            duration = self.beep_duration
 
-                    sample_rate = 44100
-                    num_samples = int(sample_rate * duration)
-                    t = np.linspace(0, duration, num_samples, dtype=np.float32)
-                    wave = np.sin(2 * np.pi * frequency * t).astype(np.float32)
+        try:
+            self.beep_queue.put_nowait((frequency, duration))
+        except queue.Full:
+            logger.debug("Beep queue is full, dropping beep")
 
-                    try:
-                        with self.audio_lock:
-                            sd.play(wave, samplerate=sample_rate)
-                        sd.wait()
-                    except Exception as e:
-                        logger.debug(f"sounddevice play failed: {e}")
-                        self.sounddevice_available = False
-                        raise
-                else:
-                    raise NotImplementedError("Using system beep")
-            except Exception:
-                try:
-                    sys.stdout.write("\a")
-                    sys.stdout.flush()
-                except Exception:
-                    pass
-            finally:
-                self.beep_playing = False
+    def _start_beep_worker(self):
+        """Start the persistent thread that plays queued beeps."""
+        if self.beep_worker_thread is not None:
+            return
 
-        thread = threading.Thread(target=_beep, daemon=True)
-        thread.start()
+        def _beep_worker():
+            """Worker thread that plays beeps until it receives a None sentinel."""
+            while True:
+                item = self.beep_queue.get()
+                if item is None:
+                    break
+                self._play_tone(*item)
+
+        self.beep_worker_thread = threading.Thread(target=_beep_worker, daemon=True)
+        self.beep_worker_thread.start()
+
+    def _play_tone(self, frequency: int, duration: float):
+        """Start a tone on the output stream, falling back to the terminal bell."""
+        self._beep_done.clear()
+        if self.sounddevice_available:
+            try:
+                if not self._stream.active:
+                    raise RuntimeError("output stream is not running")
+
+                wave = self._get_tone(frequency, duration)
+                with self.audio_lock:
+                    self._tone = wave
+                    self._tone_pos = 0
+                # _fill_output sets _beep_done once the whole tone is consumed
+                return
+            except Exception as e:
+                logger.debug("sounddevice play failed: %s", e)
+                self.sounddevice_available = False
+
+        try:
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+        except Exception:
+            pass
+        finally:
+            self._beep_done.set()
+
+    def _fill_output(self, outdata, frames: int, time_info, status):
+        """Stream callback: copy the next block of the pending tone, else silence."""
+        with self.audio_lock:
+            tone = self._tone
+            if tone is None:
+                outdata.fill(0)
+                return
+
+            start = self._tone_pos
+            chunk = tone[start : start + frames]
+            count = len(chunk)
+            outdata[:count, 0] = chunk
+            outdata[count:] = 0
+
+            self._tone_pos = start + count
+            if self._tone_pos >= len(tone):
+                self._tone = None
+                self._beep_done.set()
 
     def _start_speech_worker(self):
         """Start the speech worker thread that processes the queue."""
-        if self.speech_worker_running:
+        if self.speech_worker_thread is not None:
             return
 
-        self.speech_worker_running = True
-
         def _speech_worker():
             """Worker thread that processes speech queue sequentially."""
             logger.info("Speech worker thread started")
-            while self.speech_worker_running:
+            while not self._shutdown.is_set():
                 try:
-                    request = self.speech_queue.get(timeout=1.0)
+                    request = self._next_speech_request()
+                    if request is None:
+                        self._speech_ready.wait()
+                        self._speech_ready.clear()
+                        continue
 
+                    preview = request.text[:50]
                     if self.beep_playing:
                         logger.debug(
-                            f"Beep playing, waiting before speaking: {request.text[:50]}..."
+                            "Beep playing, waiting before speaking: %s...", preview
                         )
-                        max_wait = 0.5
-                        wait_time = 0
-                        while self.beep_playing and wait_time < max_wait:
-                            time.sleep(0.05)
-                            wait_time += 0.05
+                        self._beep_done.wait(timeout=0.5)
 
                     priority_name = "HIGH" if request.priority < -1 else "LOW"
                     logger.info(
-                        f"Processing speech request (priority={priority_name}): {request.text[:50]}..."
+                        "Processing speech request (priority=%s): %s...",
+                        priority_name,
+                        preview,
                     )
-                    self._process_speech(request.text)
-
-                    self.speech_queue.task_done()
+                    self._speaking_low = priority_name == "LOW"
+                    try:
+                        if self._synth_pool is not None:
+                            self._speak_pipelined(request)
+                        else:
+                            self._process_speech(request.text)
+                    finally:
+                        self._speaking_low = False
 
-                except queue.Empty:
-                    continue
                 except Exception as e:
-                    logger.error(f"Error in speech worker thread: {e}")
-                    import traceback
-
-                    logger.error(traceback.format_exc())
+                    # exc_info defers formatting the traceback to the handler
+                    logger.error("Error in speech worker thread: %s", e, exc_info=True)
 
         self.speech_worker_thread = threading.Thread(target=_speech_worker, daemon=True)
         self.speech_worker_thread.start()
@@ -255,17 +385,143 @@ class AudioHandler:
         priority_level = SpeechPriority.HIGH if priority else SpeechPriority.LOW
         queue_priority = -priority_level.value
 
-        request = SpeechRequest(
-            priority=queue_priority, text=text, timestamp=time.time()
+        timestamp = time.time()
+
+        if priority:
+            self._barge_in()
+        elif self._is_repeat_narration(text):
+            logger.debug("Dropping repeated narration: %s...", text[:50])
+            return
+
+        # One request per sentence, so speech starts after the first sentence is
+        # synthesized and hazards can be spoken between sentences of a narration
+        pending = self._high_speech if priority else self._low_speech
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if len(pending) == pending.maxlen:
+                logger.warning("Speech queue is full, dropping oldest request")
+            pending.append(
+                SpeechRequest(
+                    priority=queue_priority, text=sentence, timestamp=timestamp
+                )
+            )
+        self._speech_ready.set()
+        logger.debug(
+            "Queued speech request (priority=%s): %s...",
+            priority_level.name,
+            text[:50],
         )
 
+    def _is_repeat_narration(self, text: str) -> bool:
+        """Check (and record) whether text repeats the last narration too soon."""
+        now = time.monotonic()
+        with self._low_lock:
+            if (
+                text == self._last_low_text
+                and now - self._last_low_time < SPEECH_DEDUP_WINDOW
+            ):
+                return True
+            self._last_low_text = text
+            self._last_low_time = now
+        return False
+
+    def preload_phrases(self, messages: list):
+        """Synthesize known messages ahead of time so they play without delay."""
+        if self._synth_pool is None:
+            return
+
+        for message in messages:
+            for sentence in SENTENCE_BOUNDARY.split(message.strip()):
+                if sentence and sentence not in self._phrase_cache:
+                    self._phrase_cache[sentence] = self._synth_pool.submit(
+                        self._synthesize, sentence
+                    )
+
+    def _next_speech_request(self) -> Optional[SpeechRequest]:
+        """Pop the oldest HIGH priority request, else the oldest LOW one."""
+        for pending in (self._high_speech, self._low_speech):
+            try:
+                return pending.popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _peek_speech_request(self) -> Optional[SpeechRequest]:
+        """Return the request the worker will pop next, without removing it."""
+        for pending in (self._high_speech, self._low_speech):
+            try:
+                return pending[0]
+            except IndexError:
+                continue
+        return None
+
+    def _speak_pipelined(self, request: SpeechRequest):
+        """Play a request while the next queued request is synthesized."""
+        cached = self._phrase_cache.get(request.text)
+        future = self._take_prefetched(request)
+        if future is None:
+            future = cached or self._synth_pool.submit(self._synthesize, request.text)
+
+        upcoming = self._peek_speech_request()
+        if upcoming is not None and upcoming.text not in self._phrase_cache:
+            self._prefetched = (
+                upcoming,
+                self._synth_pool.submit(self._synthesize, upcoming.text),
+            )
+
+        path = future.result()
+        if path is None:
+            self._speak_system(request.text)
+            return
+
         try:
-            self.speech_queue.put(request, block=False)
-            logger.debug(
-                f"Queued speech request (priority={priority_level.name}): {text[:50]}..."
+            returncode = self._run_interruptible(["afplay", path], timeout=60)
+            if returncode > 0:
+                logger.error("Audio playback failed with exit code %s", returncode)
+        except Exception as e:
+            logger.error("Audio playback failed: %s", e)
+        finally:
+            if future is not cached:
+                self._remove_file(path)
+
+    def _take_prefetched(self, request: SpeechRequest) -> Optional[Future]:
+        """Claim the prefetched synthesis for this request, discarding a stale one."""
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched is None:
+            return None
+
+        prefetched_request, future = prefetched
+        if prefetched_request is request:
+            return future
+
+        future.add_done_callback(self._discard_synthesis)
+        return None
+
+    def _synthesize(self, text: str) -> Optional[str]:
+        """Render text to a temporary AIFF file with macOS say."""
+        fd, path = tempfile.mkstemp(suffix=".aiff")
+        os.close(fd)
+        try:
+            subprocess.run(
+                ["say", "-v", "Samantha", "-o", path, text], check=True, timeout=30
             )
-        except queue.Full:
-            logger.warning("Speech queue is full, dropping request")
+            return path
+        except Exception as e:
+            logger.warning("Speech synthesis failed: %s", e)
+            self._remove_file(path)
+            return None
+
+    def _discard_synthesis(self, future: Future):
+        """Delete the audio file of a synthesis that will not be played."""
+        if not future.cancelled() and future.result() is not None:
+            self._remove_file(future.result())
+
+    @staticmethod
+    def _remove_file(path: str):
+        """Remove a temporary audio file, ignoring errors."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
     def _process_speech(self, text: str):
         """Process a single speech request using available TTS engine."""
@@ -279,17 +535,15 @@ class AudioHandler:
     def _speak_pyttsx3(self, text: str):
         """Speak using pyttsx3."""
         try:
-            import pyttsx3
-
             if self.tts_engine is None:
                 raise RuntimeError("TTS engine not initialized")
 
-            logger.info(f"Speaking with pyttsx3: {text[:80]}...")
+            logger.debug("Speaking with pyttsx3: %s...", text[:80])
             self.tts_engine.say(text)
             self.tts_engine.runAndWait()
-            logger.info("pyttsx3 finished speaking successfully")
+            logger.debug("pyttsx3 finished speaking successfully")
         except Exception as e:
-            logger.warning(f"pyttsx3 failed: {e}")
+            logger.warning("pyttsx3 failed: %s", e)
             # Fallback to system say
             logger.info("Falling back to system say...")
             self._speak_system(text)
@@ -297,36 +551,89 @@ class AudioHandler:
     def _speak_system(self, text: str):
         """Fallback to macOS say command."""
         try:
-            import subprocess
-
-            logger.info("Using macOS 'say' command as fallback...")
-            subprocess.run(["say", "-v", "Samantha", text], check=True, timeout=30)
-            logger.info("System say command completed successfully")
+            logger.debug("Using macOS 'say' command as fallback...")
+            returncode = self._run_interruptible(
+                ["say", "-v", "Samantha", text], timeout=30
+            )
+            if returncode == 0:
+                logger.debug("System say command completed successfully")
+            elif returncode < 0:
+                logger.debug("System say command interrupted")
+            else:
+                logger.error("System say command failed with exit code %s", returncode)
         except subprocess.TimeoutExpired:
             logger.error("System say command timed out")
         except FileNotFoundError:
             logger.error("macOS 'say' command not found")
         except Exception as e:
-            logger.error(f"System say command failed: {e}")
+            logger.error("System say command failed: %s", e)
+
+    def _run_interruptible(self, command: list, timeout: float) -> int:
+        """Run a speech or playback command that barge-in may terminate."""
+        proc = subprocess.Popen(command)
+        self._active_proc = proc
+        try:
+            return proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            self._active_proc = None
+
+    def _barge_in(self):
+        """Drop pending narration and cut off narration that is being spoken."""
+        self._low_speech.clear()
+        if not self._speaking_low:
+            return
+
+        logger.debug("Interrupting narration for high priority speech")
+        proc = self._active_proc
+        if proc is not None:
+            proc.terminate()
+        elif self.tts_engine is not None:
+            try:
+                self.tts_engine.stop()
+            except Exception:
+                pass
 
     def stop(self):
         """Stop any ongoing audio output and worker thread."""
-        self.speech_worker_running = False
+        self._shutdown.set()
 
-        while not self.speech_queue.empty():
-            try:
-                self.speech_queue.get_nowait()
-                self.speech_queue.task_done()
-            except queue.Empty:
-                break
+        self._high_speech.clear()
+        self._low_speech.clear()
+        self._speech_ready.set()
 
         if self.tts_engine is not None:
             try:
-                import pyttsx3
-
                 self.tts_engine.stop()
             except Exception:
                 pass
 
+        if self.beep_worker_thread is not None:
+            try:
+                self.beep_queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self.beep_worker_thread.join(timeout=1.0)
+            self.beep_worker_thread = None
+
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+        self._beep_done.set()
+
         if self.speech_worker_thread is not None:
             self.speech_worker_thread.join(timeout=2.0)
+
+        if self._synth_pool is not None:
+            self._take_prefetched(None)
+            self._synth_pool.shutdown(wait=False, cancel_futures=True)
+            for future in self._phrase_cache.values():
+                future.add_done_callback(self._discard_synthesis)
+            self._phrase_cache.clear()
@@ -2,16 +2,58 @@
 
 import cv2
 import numpy as np
+from functools import lru_cache
+import hashlib
+import json
 from typing import Optional, Tuple
 import os
-import glob
+import sys
+import threading
+import time
 from pathlib import Path
 import logging
 
-from src.config import CAMERA_DEVICE_ID, CAMERA_FPS, CAMERA_WIDTH, CAMERA_HEIGHT
+from src.config import (
+    CAMERA_DEVICE_ID,
+    CAMERA_FPS,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    CAMERA_RING_SIZE,
+    FRAME_STORE_DIR,
+    OPENCV_THREADS,
+    TEST_IMAGE_CACHE_MB,
+)
 
 logger = logging.getLogger(__name__)
 
+# Native capture API per platform; CAP_ANY lets OpenCV probe every backend
+if sys.platform.startswith("linux"):
+    CAMERA_API = cv2.CAP_V4L2
+elif sys.platform == "darwin":
+    CAMERA_API = cv2.CAP_AVFOUNDATION
+else:
+    CAMERA_API = cv2.CAP_ANY
+
+# Video files are decoded by FFmpeg, with hardware decoding where available
+VIDEO_API = cv2.CAP_FFMPEG
+VIDEO_PARAMS = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+
+TEST_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp"})
+FRAME_STORE_NAME = "frames.npy"  # Pre-decoded (N, H, W, 3) test images
+FRAME_STORE_KEY_NAME = "frames.json"  # (name, size, mtime_ns) of each source image
+
+# Build-information entries that show whether the fast decode paths are present
+BUILD_INFO_KEYS = ("FFMPEG", "GStreamer", "JPEG", "PNG", "Parallel framework")
+
+
+@lru_cache(maxsize=None)
+def _log_opencv_build():
+    """Log OpenCV's codec and threading build details, once per process."""
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.strip().partition(":")
+        if key in BUILD_INFO_KEYS:
+            logger.info("OpenCV %s: %s", key, value.strip())
+
 
 class CameraHandler:
     """Handles camera input from iPhone or webcam."""
@@ -23,8 +65,14 @@ class CameraHandler:
         test_video_path: Optional[str] = None,
         test_images_dir: str = "test_images",
         use_camera: bool = False,
+        use_opencl: bool = False,
     ):
         """Initialize camera handler."""
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(OPENCV_THREADS)
+        cv2.ocl.setUseOpenCL(use_opencl)
+        _log_opencv_build()
+
         self.device_id = device_id
         self.test_mode = test_mode
         self.test_video_path = test_video_path
@@ -32,8 +80,30 @@ class CameraHandler:
         self.use_camera = use_camera
         self.cap: Optional[cv2.VideoCapture] = None
         self.test_images: list = []
+        self._test_image_names: list = []  # File name per test image, for labels
         self.test_image_index = 0
+        self._decoded_images: list = []  # Read-only frame per test image, or None
+        self._encoded_images: list = []  # Compressed file bytes, when too big to decode
+        self._frame_store: Optional[np.ndarray] = None  # Memory-mapped frame store
+        # Test images are paced to CAMERA_FPS against a monotonic deadline
+        self._frame_period = 1.0 / CAMERA_FPS
+        self._next_frame_time: Optional[float] = None
         self.using_video = False
+        self.frame_stride = 1  # Source frames consumed per returned frame
+        self._video_frame: Optional[np.ndarray] = None  # Reused test video buffer
+        self._first_frame_pending = False  # _video_frame holds the unplayed frame 1
+        self._video_name = "test_video"
+        self._video_position = 0  # Source frames consumed, for the frame label
+
+        # Live cameras are drained by a background thread that decodes into a
+        # ring of preallocated slots and publishes the newest one; readers wait
+        # on _frame_cond for a frame they haven't seen
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop = threading.Event()
+        self._frame_cond = threading.Condition()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._frame_seq = 0
+        self._read_seq = 0
 
         if test_video_path:
             self._load_test_video(test_video_path)
@@ -45,18 +115,18 @@ class CameraHandler:
     def _initialize_camera(self):
         """Initialize OpenCV video capture."""
         try:
-            self.cap = cv2.VideoCapture(self.device_id)
+            self.cap = self._open_capture(self.device_id, CAMERA_API)
             if not self.cap.isOpened():
                 raise RuntimeError(
                     f"Failed to open camera {self.device_id}. "
                     f"Run 'python list_cameras.py' to find available cameras."
                 )
 
-            actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
             backend = self.cap.getBackendName()
 
+            # Ask for MJPEG before the mode: compressed frames need far less USB
+            # bandwidth, so the camera can grant the full resolution and rate
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
             self.cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
@@ -64,6 +134,13 @@ class CameraHandler:
             final_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             final_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             final_fps = self.cap.get(cv2.CAP_PROP_FPS)
+            final_fourcc = self._fourcc_name(self.cap.get(cv2.CAP_PROP_FOURCC))
+            self.frame_stride = self._frame_stride_for(final_fps)
+            if final_fourcc != "MJPG":
+                logger.info(
+                    "Camera did not accept MJPG, capturing %s instead",
+                    final_fourcc or "unknown format",
+                )
 
             logger.info(
                 f"Camera {self.device_id} initialized: {final_width}x{final_height} @ {final_fps:.1f} FPS "
@@ -74,21 +151,91 @@ class CameraHandler:
                 logger.info(
                     "High resolution detected - this might be iPhone Continuity Camera"
                 )
+
+            # Keep the driver queue short so grabbed frames are never stale
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self._start_capture_thread()
         except Exception as e:
             logger.error(f"Failed to initialize camera: {e}")
             logger.info("Tip: Run 'python list_cameras.py' to find available cameras")
             raise
 
+    @staticmethod
+    def _open_capture(source, api: int, params: Optional[list] = None):
+        """Open a capture with a pinned backend, falling back to OpenCV's choice."""
+        cap = cv2.VideoCapture(source, api, params or [])
+        if cap.isOpened() or api == cv2.CAP_ANY:
+            return cap
+
+        cap.release()
+        logger.info("Preferred capture backend unavailable, letting OpenCV choose")
+        return cv2.VideoCapture(source)
+
+    def _start_capture_thread(self):
+        """Start the thread that continuously grabs frames from the camera."""
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="camera-capture", daemon=True
+        )
+        self._capture_thread.start()
+
+    def _capture_loop(self):
+        """Grab frames until stopped, publishing only the most recent one."""
+        ring = None
+        slot = 0
+        full_frame = None  # Decode buffer for frames that get downscaled
+        while not self._capture_stop.is_set():
+            dst = ring[slot] if ring is not None else None
+            ret, frame = self._grab_and_retrieve(
+                full_frame if full_frame is not None else dst
+            )
+            if not ret:
+                # Avoid spinning while the device is unavailable
+                self._capture_stop.wait(0.01)
+                continue
+
+            output_size = self._output_size(frame.shape)
+            if output_size is not None:
+                # Downscale once here so every later stage handles fewer pixels
+                full_frame = frame
+                frame = cv2.resize(
+                    frame, output_size, dst=dst, interpolation=cv2.INTER_AREA
+                )
+            else:
+                full_frame = None
+
+            if ring is None or frame.shape != ring.shape[1:]:
+                # First frame, or the mode changed: size the ring from it
+                ring = np.empty((CAMERA_RING_SIZE,) + frame.shape, dtype=frame.dtype)
+                ring[0] = frame
+                frame = ring[0]
+                slot = 0
+            slot = (slot + 1) % CAMERA_RING_SIZE
+
+            with self._frame_cond:
+                self._latest_frame = frame
+                self._frame_seq += 1
+                self._frame_cond.notify_all()
+
     def _load_test_video(self, video_path: str):
         """Load test video file."""
         video_file = Path(video_path)
-        if not video_file.exists():
-            logger.error(f"Test video file not found: {video_path}")
+        try:
+            video_size = os.stat(video_file).st_size
+        except OSError:
+            video_size = None
+
+        if not video_size:
+            if video_size is None:
+                logger.error(f"Test video file not found: {video_path}")
+            else:
+                # Rejected here, before FFmpeg spends time probing an empty file
+                logger.error(f"Test video file is empty: {video_path}")
             logger.info("Falling back to test images...")
             self._load_test_images()
             return
 
-        self.cap = cv2.VideoCapture(str(video_file))
+        self.cap = self._open_capture(str(video_file), VIDEO_API, VIDEO_PARAMS)
         if not self.cap.isOpened():
             logger.error(f"Failed to open test video: {video_path}")
             logger.warning(
@@ -112,10 +259,15 @@ class CameraHandler:
             self._load_test_images()
             return
 
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        # Play the validation frame first instead of seeking back to frame 0
+        self._video_frame = test_frame
+        self._first_frame_pending = True
+        self._video_position = 1
+        self._video_name = video_file.name
 
         self.using_video = True
         fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_stride = self._frame_stride_for(fps)
         frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -126,24 +278,185 @@ class CameraHandler:
             f"Video properties: {frame_count} frames @ {fps:.2f} FPS, "
             f"{width}x{height} (Backend: {backend})"
         )
+        if self.frame_stride > 1:
+            logger.info(
+                "Decoding 1 of every %d frames to match %d FPS",
+                self.frame_stride,
+                CAMERA_FPS,
+            )
+
+    @staticmethod
+    def _output_size(shape: tuple) -> Optional[Tuple[int, int]]:
+        """(width, height) to downscale a larger-than-configured frame to, else None."""
+        height, width = shape[:2]
+        if width <= CAMERA_WIDTH and height <= CAMERA_HEIGHT:
+            return None
+        scale = min(CAMERA_WIDTH / width, CAMERA_HEIGHT / height)
+        return round(width * scale), round(height * scale)
+
+    @staticmethod
+    def _fourcc_name(value: float) -> str:
+        """Decode a CAP_PROP_FOURCC value into its four-character code."""
+        code = int(value)
+        return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\0 ")
+
+    @staticmethod
+    def _frame_stride_for(source_fps: float) -> int:
+        """Number of source frames per processed frame at CAMERA_FPS."""
+        if not source_fps or source_fps <= 0:
+            return 1
+        return max(1, int(source_fps / CAMERA_FPS))
 
     def _load_test_images(self):
         """Load test images from directory (fallback mode)."""
         test_path = Path(self.test_images_dir)
-        if not test_path.exists():
+
+        # One directory pass, which also checks that the directory exists;
+        # hidden files are skipped, as glob's "*" would
+        try:
+            with os.scandir(test_path) as entries:
+                self.test_images.extend(
+                    entry.path
+                    for entry in entries
+                    if not entry.name.startswith(".")
+                    and os.path.splitext(entry.name)[1].lower() in TEST_IMAGE_EXTENSIONS
+                    and entry.is_file()
+                )
+        except (FileNotFoundError, NotADirectoryError):
             logger.warning(f"Test images directory {self.test_images_dir} not found")
             return
 
-        extensions = ["*.jpg", "*.jpeg", "*.png", "*.bmp"]
-        for ext in extensions:
-            self.test_images.extend(glob.glob(str(test_path / ext)))
-
         self.test_images.sort()
+        self._test_image_names = [Path(img_path).name for img_path in self.test_images]
+        self._cache_test_images()
         logger.info(f"Loaded {len(self.test_images)} test images (fallback mode)")
         logger.warning(
             "Using static images - consider using a video file for better testing"
         )
 
+    def _cache_test_images(self):
+        """Decode every test image once, unless they exceed TEST_IMAGE_CACHE_MB.
+
+        Past the budget, same-sized images are played from a memory-mapped
+        frame store; otherwise only the compressed file bytes are kept, and
+        frames are decoded from memory on demand.
+        """
+        encoded = [self._read_image_bytes(img_path) for img_path in self.test_images]
+
+        budget = TEST_IMAGE_CACHE_MB * 1024 * 1024
+        frames = []
+        for data in encoded:
+            frame = self._decode_image(data)
+            if frame is not None:
+                budget -= frame.nbytes
+                if budget < 0:
+                    logger.info(
+                        "Test images exceed %d MB decoded; not caching frames",
+                        TEST_IMAGE_CACHE_MB,
+                    )
+                    self._frame_store = self._open_frame_store(encoded)
+                    if self._frame_store is None:
+                        self._encoded_images = encoded
+                    return
+            frames.append(frame)
+
+        shapes = {frame.shape for frame in frames if frame is not None}
+        if len(shapes) == 1 and all(frame is not None for frame in frames):
+            # Same-sized images share one contiguous block; frames are views into it
+            pool = np.empty((len(frames),) + shapes.pop(), dtype=frames[0].dtype)
+            for slot, frame in zip(pool, frames):
+                np.copyto(slot, frame)
+            frames = list(pool)
+            pool.flags.writeable = False
+
+        for frame in frames:
+            if frame is not None:
+                frame.flags.writeable = False
+        self._decoded_images = frames
+
+    def _open_frame_store(self, encoded: list) -> Optional[np.ndarray]:
+        """Memory-map the decoded test images, (re)building the store if stale.
+
+        Returns None when the images differ in size or the store can't be written.
+        """
+        # One store per images directory, kept out of the (tracked) directory itself
+        images_dir = os.path.abspath(self.test_images_dir)
+        store_dir = os.path.join(
+            FRAME_STORE_DIR, hashlib.sha1(images_dir.encode()).hexdigest()[:16]
+        )
+        store_path = os.path.join(store_dir, FRAME_STORE_NAME)
+        key_path = os.path.join(store_dir, FRAME_STORE_KEY_NAME)
+
+        try:
+            key = []
+            for path, name in zip(self.test_images, self._test_image_names):
+                stat = os.stat(path)
+                key.append([name, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            return None
+
+        try:
+            with open(key_path) as f:
+                if json.load(f) == key:
+                    store = np.load(store_path, mmap_mode="r")
+                    logger.info("Playing test images from %s", store_path)
+                    return store
+        except (OSError, ValueError):
+            pass
+
+        first = self._decode_image(encoded[0])
+        if first is None:
+            return None
+
+        temp_path = store_path + ".tmp"
+        try:
+            os.makedirs(store_dir, exist_ok=True)
+            # Drop the old key first so a half-written rebuild is never trusted
+            if os.path.exists(key_path):
+                os.remove(key_path)
+            # Written one frame at a time, so the full set is never held in RAM
+            store = np.lib.format.open_memmap(
+                temp_path,
+                mode="w+",
+                dtype=first.dtype,
+                shape=(len(encoded),) + first.shape,
+            )
+            store[0] = first
+            for i in range(1, len(encoded)):
+                frame = self._decode_image(encoded[i])
+                if frame is None or frame.shape != first.shape:
+                    del store
+                    os.remove(temp_path)
+                    return None
+                store[i] = frame
+            store.flush()
+            del store
+            os.replace(temp_path, store_path)
+            with open(key_path + ".tmp", "w") as f:
+                json.dump(key, f)
+            os.replace(key_path + ".tmp", key_path)
+        except OSError as e:
+            logger.debug("Could not write frame store %s: %s", store_path, e)
+            return None
+
+        logger.info("Wrote %d test frames to %s", len(encoded), store_path)
+        return np.load(store_path, mmap_mode="r")
+
+    @staticmethod
+    def _read_image_bytes(img_path: str) -> Optional[np.ndarray]:
+        """Read an image file's compressed bytes without decoding them."""
+        try:
+            return np.fromfile(img_path, dtype=np.uint8)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _decode_image(data: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Decode compressed image bytes to BGR, or None if they are invalid."""
+        if data is None or data.size == 0:
+            return None
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray], Optional[str]]:
         """Read a frame from camera, test video, or test images."""
         if self.using_video:
@@ -156,43 +469,67 @@ class CameraHandler:
             return self._read_test_frame()
 
     def _read_camera_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
-        """Read frame from camera."""
+        """Read frame from camera.
+
+        The frame is a view into the capture ring and is overwritten after
+        CAMERA_RING_SIZE - 1 more frames; copy it to keep it longer.
+        """
         if self.cap is None:
             return False, None
 
-        ret, frame = self.cap.read()
-        if not ret:
-            logger.warning("Failed to read frame from camera")
-            return False, None
+        with self._frame_cond:
+            has_new_frame = self._frame_cond.wait_for(
+                lambda: self._frame_seq != self._read_seq, timeout=1.0
+            )
+            if not has_new_frame:
+                logger.warning("Failed to read frame from camera")
+                return False, None
 
-        return True, frame
+            self._read_seq = self._frame_seq
+            return True, self._latest_frame
 
     def _read_test_video_frame(
         self,
     ) -> Tuple[bool, Optional[np.ndarray], Optional[str]]:
-        """Read frame from test video file."""
+        """Read frame from test video file.
+
+        Frames are decoded into one reused buffer, so the returned frame is
+        overwritten by the next call; copy it to keep it longer.
+        """
         if self.cap is None:
             return False, None, None
 
-        ret, frame = self.cap.read()
+        if self._first_frame_pending:
+            self._first_frame_pending = False
+            ret, frame = True, self._video_frame
+        else:
+            ret, frame = self._grab_and_retrieve(self._video_frame)
+            self._video_position += self.frame_stride
 
         if not ret:
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.cap.read()
+            ret, frame = self._grab_and_retrieve(self._video_frame)
+            self._video_position = self.frame_stride
 
             if not ret:
                 logger.warning("Failed to read from test video")
                 return False, None, None
 
-        video_name = (
-            Path(self.test_video_path).name if self.test_video_path else "test_video"
-        )
-        current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        self._video_frame = frame
 
-        source_name = f"{video_name} (frame {current_frame})"
+        source_name = f"{self._video_name} (frame {self._video_position})"
 
         return True, frame, source_name
 
+    def _grab_and_retrieve(
+        self, dst: Optional[np.ndarray] = None
+    ) -> Tuple[bool, Optional[np.ndarray]]:
+        """Grab frame_stride frames but decode only the last one, into dst if given."""
+        for _ in range(self.frame_stride):
+            if not self.cap.grab():
+                return False, None
+        return self.cap.retrieve(dst)
+
     def _read_test_frame(self) -> Tuple[bool, Optional[np.ndarray], Optional[str]]:
         """Read frame from test images (loops through images - fallback mode)."""
         if len(self.test_images) == 0:
@@ -200,26 +537,46 @@ class CameraHandler:
             return False, None, None
 
         img_path = self.test_images[self.test_image_index]
-        frame = cv2.imread(img_path)
+        frame = None
+        if self._decoded_images:
+            frame = self._decoded_images[self.test_image_index]
+        elif self._frame_store is not None:
+            frame = self._frame_store[self.test_image_index]
+        elif self._encoded_images:
+            frame = self._decode_image(self._encoded_images[self.test_image_index])
+        if frame is None:
+            frame = cv2.imread(img_path)
 
         if frame is None:
             logger.warning(f"Failed to load test image: {img_path}")
             return False, None, None
 
-        from pathlib import Path
-
-        image_name = Path(img_path).name
+        image_name = self._test_image_names[self.test_image_index]
 
         self.test_image_index = (self.test_image_index + 1) % len(self.test_images)
 
-        import time
-
-        time.sleep(1.0 / CAMERA_FPS)
+        self._wait_for_next_frame()
 
         return True, frame, image_name
 
+    def _wait_for_next_frame(self):
+        """Sleep until the next frame deadline, without accumulating drift."""
+        now = time.monotonic()
+        if self._next_frame_time is None or now - self._next_frame_time > 1.0:
+            # First frame, or the caller stalled: restart the schedule
+            self._next_frame_time = now
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next_frame_time += self._frame_period
+
     def release(self):
         """Release camera resources."""
+        if self._capture_thread is not None:
+            self._capture_stop.set()
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+
         if self.cap is not None:
             self.cap.release()
             logger.info("Camera released")
@@ -14,6 +14,7 @@ from pynput import keyboard
 
 from src.config import (
     REFLEX_LOOP_FPS,
+    DISPLAY_FPS,
     COGNITIVE_LOOP_TIMEOUT,
     CAMERA_WIDTH,
     CAMERA_HEIGHT,
@@ -21,6 +22,7 @@ from src.config import (
     TEST_MODE_DISABLE_AUDIO,
     SHOW_TRACKING_VISUALIZATION,
     VISUAL_WARNING_PERSISTENCE_DURATION,
+    BEEP_SUPPRESS_AREA_RATIO,
 )
 from src.hardware.camera import CameraHandler
 from src.hardware.audio import AudioHandler
@@ -30,7 +32,7 @@ from src.cognitive_loop.history import HistoryBuffer
 from src.cognitive_loop.scene_composer import SceneComposer
 from src.cognitive_loop.trajectory import TrajectoryAnalyzer
 from src.cognitive_loop.narrator import LLMNarrator
-from src.utils.threading import ThreadSafeQueue
+from src.utils.threading import FrameRing, ThreadSafeQueue
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -65,13 +67,14 @@ class DualLoopSystem:
 
         self.tracker = YOLOTracker()
         self.safety_monitor = SafetyMonitor(CAMERA_WIDTH, CAMERA_HEIGHT)
+        self.audio.preload_phrases(self.safety_monitor.warning_messages())
 
         self.history_buffer = HistoryBuffer()
         self.scene_composer = SceneComposer()
         self.trajectory_analyzer = TrajectoryAnalyzer()
         self.narrator = LLMNarrator()
 
-        self.reflex_queue = ThreadSafeQueue(maxsize=5)
+        self.reflex_queue = FrameRing(capacity=4)
         self.cognitive_queue = ThreadSafeQueue(maxsize=1)
         self.reflex_thread: Optional[threading.Thread] = None
         self.cognitive_thread: Optional[threading.Thread] = None
@@ -95,6 +98,8 @@ class DualLoopSystem:
         self.show_visualization = SHOW_TRACKING_VISUALIZATION
 
         self.last_hazard_detection_time = 0.0
+        # Frames with a high priority hazard left until the next quiet-mode log
+        self._hazard_log_countdown = 0
         self.visual_warning_duration = VISUAL_WARNING_PERSISTENCE_DURATION
 
         self.video_writer: Optional[cv2.VideoWriter] = None
@@ -153,37 +158,45 @@ class DualLoopSystem:
     def _main_loop(self):
         """Main loop: capture frames and distribute to queues."""
         frame_time = 1.0 / REFLEX_LOOP_FPS
+        display_time = 1.0 / DISPLAY_FPS
+        next_deadline = time.monotonic()
+        next_display = next_deadline
 
         while self.running:
-            start_time = time.time()
-
             success, frame, image_name = self.camera.read_frame()
             if not success:
                 logger.warning("Failed to read frame")
                 time.sleep(0.1)
+                next_deadline = time.monotonic()
                 continue
 
+            # The camera reuses its buffers, so take one owned snapshot and share
+            # it read-only with both loops instead of copying it for each
+            frame = frame.copy()
+            frame.flags.writeable = False
+
             with self.frame_lock:
-                self.current_frame = frame.copy()
+                self.current_frame = frame
                 self.current_image_name = image_name
                 self.frame_id += 1
 
-            try:
-                self.reflex_queue.put(
-                    (self.frame_id, frame.copy(), time.time(), image_name), block=False
-                )
-            except:
-                pass
+            # Drops the frame if the reflex loop is still behind
+            self.reflex_queue.put(self.frame_id, frame, time.time(), image_name)
 
             if self.show_visualization:
                 with self.frame_lock:
                     if self.annotated_frame is not None:
                         try:
-                            cv2.imshow(
-                                "Describe My Environment - Tracking",
-                                self.annotated_frame,
-                            )
-                            cv2.waitKey(1)
+                            # imshow/waitKey only refresh the window, so run them at
+                            # the display rate rather than on every captured frame
+                            now = time.monotonic()
+                            if now >= next_display:
+                                cv2.imshow(
+                                    "Describe My Environment - Tracking",
+                                    self.annotated_frame,
+                                )
+                                cv2.waitKey(1)
+                                next_display = max(next_display + display_time, now)
 
                             if self.record_video and self.video_writer is not None:
                                 frame_to_write = self.annotated_frame
@@ -198,9 +211,14 @@ class DualLoopSystem:
                             logger.debug(f"Error displaying frame: {e}")
                             pass
 
-            elapsed = time.time() - start_time
-            sleep_time = max(0, frame_time - elapsed)
-            time.sleep(sleep_time)
+            # Sleep to a fixed schedule so per-iteration overhead doesn't drift the
+            # rate; after a stall, restart the schedule instead of bursting to catch up
+            next_deadline += frame_time
+            now = time.monotonic()
+            if next_deadline > now:
+                time.sleep(next_deadline - now)
+            else:
+                next_deadline = now
 
     def _reflex_loop(self):
         """Reflex loop: fast safety monitoring at 30 FPS."""
@@ -209,14 +227,10 @@ class DualLoopSystem:
         while self.running:
             try:
                 item = self.reflex_queue.get(timeout=0.1)
-                if item is None:
+                if item is None:  # Timed out with no frame published
                     continue
 
-                if len(item) == 4:
-                    frame_id, frame, timestamp, image_name = item
-                else:
-                    frame_id, frame, timestamp = item
-                    image_name = None
+                frame_id, frame, timestamp, image_name = item
 
                 result = self.tracker.track(
                     frame, frame_id, timestamp, return_annotated=self.show_visualization
@@ -228,14 +242,7 @@ class DualLoopSystem:
                     detections, _ = result
                     annotated_frame = None
 
-                for detection in detections:
-                    if detection.track_id is not None:
-                        object_id = detection.track_id
-                    else:
-                        object_id = hash(
-                            (tuple(detection.box), detection.class_name)
-                        ) % (2**31)
-                    self.history_buffer.add_detection(object_id, detection)
+                self.history_buffer.add_detections(detections)
 
                 hazards = self.safety_monitor.check_hazards(
                     detections, self.history_buffer
@@ -308,9 +315,14 @@ class DualLoopSystem:
                             continue
 
                     if self.test_mode and TEST_MODE_QUIET_HAZARDS:
-                        if high_priority and frame_id % 30 == 0:
-                            img_info = f" [{image_name}]" if image_name else ""
-                            logger.info(f"HAZARD (test mode{img_info}): {warning_msg}")
+                        if high_priority:
+                            self._hazard_log_countdown -= 1
+                            if self._hazard_log_countdown <= 0:
+                                self._hazard_log_countdown = 30
+                                img_info = f" [{image_name}]" if image_name else ""
+                                logger.info(
+                                    f"HAZARD (test mode{img_info}): {warning_msg}"
+                                )
                     else:
                         img_info = (
                             f" [{image_name}]"
@@ -323,25 +335,17 @@ class DualLoopSystem:
 
                         should_beep = True
                         if high_priority:
-                            for hazard in hazards:
-                                if hazard.priority == "high":
-                                    hazard_obj = self.history_buffer.get_object(
-                                        hazard.object_id
-                                    )
-                                    if hazard_obj:
-                                        latest = hazard_obj.get_latest()
-                                        if latest:
-                                            frame_area = (
-                                                self.safety_monitor.frame_width
-                                                * self.safety_monitor.frame_height
-                                            )
-                                            area_ratio = latest.area / frame_area
-                                            if area_ratio > 0.4:
-                                                should_beep = False
-                                                logger.debug(
-                                                    f"Suppressing beep - object too close (area ratio: {area_ratio:.2f})"
-                                                )
-                                                break
+                            area_ratio = (
+                                self.safety_monitor.max_high_priority_area_ratio(
+                                    hazards
+                                )
+                            )
+                            if area_ratio > BEEP_SUPPRESS_AREA_RATIO:
+                                should_beep = False
+                                logger.debug(
+                                    "Suppressing beep - object too close (area ratio: %.2f)",
+                                    area_ratio,
+                                )
 
                         if high_priority:
                             if should_beep:
@@ -365,11 +369,6 @@ class DualLoopSystem:
                             self.last_warning_time = current_time
                             self.last_warned_hazard_id = current_hazard_id
 
-                if frame_id % 30 == 0:
-                    self.history_buffer.cleanup_stale_objects(frame_id)
-
-            except Empty:
-                continue
             except Exception as e:
                 logger.error(f"Error in reflex loop: {e}")
 
@@ -380,6 +379,11 @@ class DualLoopSystem:
         while self.running:
             try:
                 item = self.cognitive_queue.get(timeout=0.5)
+
+                # Stale-object cleanup walks every tracked object, so it runs here
+                # (every wakeup, and before narrating) rather than on the reflex loop
+                self.history_buffer.cleanup_stale_objects(self.frame_id)
+
                 if item is None:
                     continue
 
@@ -388,7 +392,8 @@ class DualLoopSystem:
                 with self.frame_lock:
                     if self.current_frame is None:
                         continue
-                    frame = self.current_frame.copy()
+                    # Published frames are read-only snapshots, so a reference is enough
+                    frame = self.current_frame
                     current_frame_id = self.frame_id
                     current_image_name = self.current_image_name
 
@@ -1,11 +1,16 @@
 """Physics engine for calculating velocity and expansion."""
 
+from math import hypot
 from typing import Tuple, Optional, List
 import numpy as np
 import logging
 
 from src.utils.data_structures import TrackedObject, DetectionPoint
-from src.config import CENTER_ZONE_THRESHOLD, EXPANSION_TIME_WINDOW
+from src.config import (
+    CENTER_ZONE_THRESHOLD,
+    EXPANSION_TIME_WINDOW,
+    MIN_APPROACH_DISTANCE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +21,7 @@ class PhysicsEngine:
     @staticmethod
     def calculate_velocity(tracked_object: TrackedObject) -> Tuple[float, float]:
         """Calculate velocity vector (delta_x, delta_y) in pixels per frame."""
-        history = tracked_object.get_trajectory()
+        history = tracked_object.history  # only the ends are read, so no copy
         if len(history) < 2:
             return (0.0, 0.0)
 
@@ -61,6 +66,32 @@ class PhysicsEngine:
 
         return growth_percentage
 
+    @staticmethod
+    def calculate_velocity_and_area(
+        tracked_object: TrackedObject, time_window: float = EXPANSION_TIME_WINDOW
+    ) -> Tuple[float, float, float]:
+        """Calculate (delta_x, delta_y, area_growth) from a single trajectory read."""
+        features = tracked_object.feature_array()
+        count = len(features)
+        if count < 2:
+            return (0.0, 0.0, 0.0)
+
+        center_x, center_y, areas, timestamps = features.T
+
+        num_frames = count - 1
+        delta_x = float(center_x[-1] - center_x[0]) / num_frames
+        delta_y = float(center_y[-1] - center_y[0]) / num_frames
+
+        window_start_time = timestamps[-1] - time_window
+        oldest = int(np.argmax(timestamps >= window_start_time))
+
+        if oldest == num_frames or areas[oldest] == 0:
+            return (delta_x, delta_y, 0.0)
+
+        area_growth = float((areas[-1] - areas[oldest]) / areas[oldest]) * 100.0
+
+        return (delta_x, delta_y, area_growth)
+
     @staticmethod
     def is_in_center_zone(
         box: Tuple[int, int, int, int], frame_width: int, frame_height: int
@@ -94,7 +125,7 @@ class PhysicsEngine:
         tracked_object: TrackedObject, frame_width: int, frame_height: int
     ) -> bool:
         """Check if object center is moving toward the frame center (approaching camera)."""
-        history = tracked_object.get_trajectory()
+        history = tracked_object.history  # only the ends are read, so no copy
         if len(history) < 2:
             return False
 
@@ -104,15 +135,12 @@ class PhysicsEngine:
         frame_center_x = frame_width / 2
         frame_center_y = frame_height / 2
 
-        first_dist_x = abs(first.center[0] - frame_center_x)
-        first_dist_y = abs(first.center[1] - frame_center_y)
-        first_distance = (first_dist_x**2 + first_dist_y**2) ** 0.5
-
-        last_dist_x = abs(last.center[0] - frame_center_x)
-        last_dist_y = abs(last.center[1] - frame_center_y)
-        last_distance = (last_dist_x**2 + last_dist_y**2) ** 0.5
-
-        from src.config import MIN_APPROACH_DISTANCE
+        first_distance = hypot(
+            first.center[0] - frame_center_x, first.center[1] - frame_center_y
+        )
+        last_distance = hypot(
+            last.center[0] - frame_center_x, last.center[1] - frame_center_y
+        )
 
         distance_change = first_distance - last_distance
         return distance_change > MIN_APPROACH_DISTANCE
@@ -1,5 +1,6 @@
 """Safety monitoring for proximity warnings."""
 
+from math import hypot
 from typing import List, Dict, Optional
 import logging
 
@@ -10,16 +11,28 @@ from src.config import HAZARD_CLASSES, EXPANSION_THRESHOLD, EXPANSION_TIME_WINDO
 
 logger = logging.getLogger(__name__)
 
+# Spoken warnings by hazard priority, filled with the capitalized class name
+HIGH_WARNING = "STOP! {} in front of you"
+MEDIUM_WARNING = "Warning: {} detected"
+
 
 class Hazard:
     """Represents a detected hazard."""
 
-    def __init__(self, object_id: int, class_name: str, priority: str, reason: str):
+    def __init__(
+        self,
+        object_id: int,
+        class_name: str,
+        priority: str,
+        reason: str,
+        area: int = 0,
+    ):
         """Initialize hazard."""
         self.object_id = object_id
         self.class_name = class_name
         self.priority = priority
         self.reason = reason
+        self.area = area  # Box area of the detection that raised the hazard
 
 
 class SafetyMonitor:
@@ -41,11 +54,7 @@ class SafetyMonitor:
             if detection.class_name.lower() not in [c.lower() for c in HAZARD_CLASSES]:
                 continue
 
-            object_id = (
-                detection.track_id
-                if detection.track_id is not None
-                else detection.frame_id
-            )
+            object_id = detection.object_id
             tracked_obj = history_buffer.get_object(object_id)
             if tracked_obj is None:
                 tracked_obj = TrackedObject(object_id)
@@ -66,7 +75,7 @@ class SafetyMonitor:
             )
 
             velocity_x, velocity_y = self.physics_engine.calculate_velocity(tracked_obj)
-            speed = (velocity_x**2 + velocity_y**2) ** 0.5
+            speed = hypot(velocity_x, velocity_y)
             is_moving = speed > 5.0
 
             priority = None
@@ -86,16 +95,13 @@ class SafetyMonitor:
                     priority = "medium"
 
             if priority:
-                object_id = (
-                    detection.track_id
-                    if detection.track_id is not None
-                    else detection.frame_id
-                )
+                object_id = detection.object_id
                 hazard = Hazard(
                     object_id=object_id,
                     class_name=detection.class_name,
                     priority=priority,
                     reason=", ".join(reasons),
+                    area=detection.area,
                 )
                 hazards.append(hazard)
 
@@ -105,6 +111,14 @@ class SafetyMonitor:
         """Determine if warning should be triggered."""
         return any(h.priority in ["high", "medium"] for h in hazards)
 
+    def max_high_priority_area_ratio(self, hazards: List[Hazard]) -> float:
+        """Largest fraction of the frame covered by a high priority hazard."""
+        frame_area = self.frame_width * self.frame_height
+        return max(
+            (h.area / frame_area for h in hazards if h.priority == "high"),
+            default=0.0,
+        )
+
     def get_warning_message(self, hazards: List[Hazard]) -> str:
         """Generate warning message from hazards."""
         if not hazards:
@@ -113,11 +127,18 @@ class SafetyMonitor:
         high_priority = [h for h in hazards if h.priority == "high"]
         if high_priority:
             hazard = high_priority[0]
-            class_name_formatted = hazard.class_name.capitalize()
-            return f"STOP! {class_name_formatted} in front of you"
+            return HIGH_WARNING.format(hazard.class_name.capitalize())
 
         medium_priority = [h for h in hazards if h.priority == "medium"]
         if medium_priority:
             hazard = medium_priority[0]
-            class_name_formatted = hazard.class_name.capitalize()
-            return f"Warning: {class_name_formatted} detected"
+            return MEDIUM_WARNING.format(hazard.class_name.capitalize())
+
+    def warning_messages(self) -> List[str]:
+        """List every warning get_warning_message can produce, for pre-synthesis."""
+        messages = []
+        for class_name in HAZARD_CLASSES:
+            formatted = class_name.capitalize()
+            messages.append(HIGH_WARNING.format(formatted))
+            messages.append(MEDIUM_WARNING.format(formatted))
+        return messages
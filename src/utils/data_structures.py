@@ -1,8 +1,16 @@
 """Data structures for tracking and detection."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Tuple, List, Optional
 from collections import deque
+import sys
+import time
+
+import numpy as np
+
+from src.config import HANDHELD_CLASSES
+
+HANDHELD_CLASS_SET = frozenset(map(sys.intern, HANDHELD_CLASSES))
 
 
 @dataclass
@@ -16,6 +24,21 @@ class DetectionPoint:
     class_name: str  # Object class name
     confidence: float  # Detection confidence
     track_id: Optional[int] = None  # Tracking ID from YOLO
+    object_id: int = field(init=False, repr=False)  # History key, set once below
+
+    def __post_init__(self):
+        """Key untracked detections by their packed box and class name."""
+        if self.track_id is not None:
+            self.object_id = self.track_id
+            return
+        x1, y1, x2, y2 = self.box
+        packed = (
+            (int(x1) & 0xFFFF)
+            | (int(y1) & 0xFFFF) << 16
+            | (int(x2) & 0xFFFF) << 32
+            | (int(y2) & 0xFFFF) << 48
+        )
+        self.object_id = packed ^ (hash(self.class_name) & 0x7FFFFFFFFFFFFFFF)
 
 
 class TrackedObject:
@@ -28,15 +51,39 @@ class TrackedObject:
         self.first_seen: Optional[float] = None
         self.last_seen: Optional[float] = None
         self.class_name: Optional[str] = None
+        self.class_name_lower: str = ""  # cached for per-frame class checks
+        self.is_handheld: bool = False
+        # Numeric mirror of history: rows of (center_x, center_y, area, timestamp)
+        self._features = np.empty((maxlen, 4), dtype=np.float64)
+        self._ring = (0, 0)  # (next write row, row count)
+        # Seqlock for _features/_ring: odd while a row is being written, so readers
+        # on other threads can detect a torn snapshot and retry
+        self._seq = 0
     
     def add_detection(self, detection_point: DetectionPoint):
         """Add a new detection point to the history."""
         self.history.append(detection_point)
+        head, count = self._ring
+        center_x, center_y = detection_point.center
+        capacity = len(self._features)
+        self._seq += 1
+        self._features[head] = (
+            center_x, center_y, detection_point.area, detection_point.timestamp
+        )
+        self._ring = ((head + 1) % capacity, min(count + 1, capacity))
+        self._seq += 1
         if self.first_seen is None:
             self.first_seen = detection_point.timestamp
         self.last_seen = detection_point.timestamp
         if self.class_name is None:
             self.class_name = detection_point.class_name
+            self.class_name_lower = sys.intern((self.class_name or "").lower())
+            self.is_handheld = self.class_name_lower in HANDHELD_CLASS_SET
+    
+    @property
+    def num_detections(self) -> int:
+        """Number of detection points in the history (no copy)."""
+        return len(self.history)
     
     def get_trajectory(self, frames_back: Optional[int] = None) -> List[DetectionPoint]:
         """Get trajectory points."""
@@ -44,6 +91,23 @@ class TrackedObject:
             return list(self.history)
         return list(self.history)[-frames_back:]
     
+    def feature_array(self) -> np.ndarray:
+        """Get history as a chronological (N, 4) array of center_x, center_y, area, timestamp."""
+        while True:
+            seq = self._seq
+            if seq & 1:
+                time.sleep(0)  # Writer is mid-update; yield so it can finish
+                continue
+            head, count = self._ring
+            if count < len(self._features):
+                features = self._features[:count].copy()
+            else:
+                features = np.concatenate(
+                    (self._features[head:], self._features[:head])
+                )
+            if self._seq == seq:
+                return features
+    
     def get_latest(self) -> Optional[DetectionPoint]:
         """Get the most recent detection point."""
         if len(self.history) == 0:
@@ -41,3 +41,56 @@ class ThreadSafeQueue:
                 except Empty:
                     break
 
+
+
+class FrameRing:
+    """Single-producer/single-consumer ring of preallocated frame slots.
+
+    Each slot holds (frame_id, frame, timestamp, image_name). The producer only
+    advances ``_head`` and the consumer only advances ``_tail``, so neither side
+    takes a lock; an Event wakes the consumer when it finds the ring empty.
+    When the ring is full, new frames are dropped.
+    """
+    
+    def __init__(self, capacity: int = 4):
+        """Initialize ring; capacity is rounded up to a power of two."""
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._mask = size - 1
+        self._slots = [[0, None, 0.0, None] for _ in range(size)]
+        self._head = 0
+        self._tail = 0
+        self._ready = threading.Event()
+    
+    def put(self, frame_id: int, frame, timestamp: float, image_name=None) -> bool:
+        """Publish a frame (producer side). Returns False if the ring is full."""
+        head = self._head
+        if head - self._tail > self._mask:
+            return False
+        slot = self._slots[head & self._mask]
+        slot[0] = frame_id
+        slot[1] = frame
+        slot[2] = timestamp
+        slot[3] = image_name
+        self._head = head + 1
+        self._ready.set()
+        return True
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[tuple]:
+        """Take the oldest frame (consumer side), or None after timeout."""
+        tail = self._tail
+        if tail == self._head:
+            # Clear before re-checking so a put between the two can't be missed
+            self._ready.clear()
+            if tail == self._head and not self._ready.wait(timeout):
+                return None
+        slot = self._slots[tail & self._mask]
+        item = (slot[0], slot[1], slot[2], slot[3])
+        slot[1] = None  # Don't keep the frame alive after it's consumed
+        self._tail = tail + 1
+        return item
+    
+    def __len__(self) -> int:
+        """Number of frames waiting to be consumed."""
+        return self._head - self._tail
@@ -0,0 +1,76 @@
+"""Tests for LLM narrator."""
+
+import unittest
+from unittest.mock import patch
+from src.cognitive_loop.narrator import LLMNarrator, SYSTEM_PROMPT
+
+
+class TestLLMNarrator(unittest.TestCase):
+    """Test narrator prompt handling and caching."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.narrator = LLMNarrator()
+
+    def test_clean_narration(self):
+        """Test removal of follow-up questions."""
+        narration = "A person is walking towards you.. Would you like more details?"
+        cleaned = self.narrator._clean_narration(narration)
+
+        self.assertEqual(cleaned, "A person is walking towards you.")
+
+    def test_prompt_carries_only_scene_text(self):
+        """Test that fixed instructions stay in SYSTEM_PROMPT, not the per-call prompt."""
+        prompt = self.narrator.compose_prompt("a street", ["car: Approaching"])
+
+        self.assertEqual(
+            prompt,
+            'Context: "a street"\n'
+            "Entities (detected by object detection system):\n"
+            "- car: Approaching",
+        )
+        self.assertIn("TASK: Synthesize", SYSTEM_PROMPT)
+        self.assertIn("6. Ignore any coordinates", SYSTEM_PROMPT)
+        self.assertNotIn("TASK:", prompt)
+
+    def test_prompt_without_movements(self):
+        """Test the placeholder entity line when nothing was detected."""
+        prompt = self.narrator.compose_prompt("an empty room", [])
+
+        self.assertTrue(prompt.endswith("- No objects detected."))
+
+    def test_reuses_narration_for_unchanged_scene(self):
+        """Test that an unchanged scene does not call Ollama again."""
+        movements = ["car: Stationary"]
+
+        with patch.object(
+            self.narrator, "generate_narration", return_value="A car is parked."
+        ) as generate:
+            first = self.narrator.generate_narration_from_components("a street", movements)
+            second = self.narrator.generate_narration_from_components("a street", movements)
+
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_regenerates_when_movements_change(self):
+        """Test that changed movements trigger a new narration."""
+        with patch.object(
+            self.narrator, "generate_narration", return_value="A car."
+        ) as generate:
+            self.narrator.generate_narration_from_components("a street", ["car: Stationary"])
+            self.narrator.generate_narration_from_components("a street", ["car: Approaching"])
+
+        self.assertEqual(generate.call_count, 2)
+
+    def test_check_connection_is_cached(self):
+        """Test that repeated health checks reuse the cached result."""
+        with patch("src.cognitive_loop.narrator.requests.get") as get:
+            get.return_value.status_code = 200
+            self.assertTrue(self.narrator.check_connection())
+            self.assertTrue(self.narrator.check_connection())
+
+        self.assertEqual(get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
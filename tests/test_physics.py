@@ -62,6 +62,51 @@ class TestPhysicsEngine(unittest.TestCase):
         # Should show positive growth
         self.assertGreater(growth, 0)
     
+    def test_calculate_velocity_and_area_matches_separate_calls(self):
+        """Test fused velocity/area calculation against the separate methods."""
+        tracked_obj = TrackedObject(object_id=1)
+        
+        base_time = time.time()
+        for i in range(10):
+            area = 1000 + i * 150
+            detection = DetectionPoint(
+                frame_id=i,
+                timestamp=base_time + i * 0.2,
+                box=(i * 8, 100, i * 8 + 40, 140),
+                area=area,
+                center=(i * 8 + 20, 120 - i),
+                class_name="car",
+                confidence=0.9
+            )
+            tracked_obj.add_detection(detection)
+        
+        delta_x, delta_y, growth = self.physics.calculate_velocity_and_area(tracked_obj)
+        
+        self.assertEqual((delta_x, delta_y), self.physics.calculate_velocity(tracked_obj))
+        self.assertAlmostEqual(growth, self.physics.calculate_area_growth(tracked_obj))
+    
+    def test_calculate_velocity_and_area_after_history_wraps(self):
+        """Test fused calculation once the history ring buffer has wrapped."""
+        tracked_obj = TrackedObject(object_id=1, maxlen=4)
+        
+        base_time = time.time()
+        for i in range(7):
+            detection = DetectionPoint(
+                frame_id=i,
+                timestamp=base_time + i * 0.2,
+                box=(i * 8, 100, i * 8 + 40, 140),
+                area=1000 + i * 150,
+                center=(i * 8 + 20, 120 - i),
+                class_name="car",
+                confidence=0.9
+            )
+            tracked_obj.add_detection(detection)
+        
+        delta_x, delta_y, growth = self.physics.calculate_velocity_and_area(tracked_obj)
+        
+        self.assertEqual((delta_x, delta_y), self.physics.calculate_velocity(tracked_obj))
+        self.assertAlmostEqual(growth, self.physics.calculate_area_growth(tracked_obj))
+    
     def test_is_in_center_zone(self):
         """Test center zone detection."""
         frame_width = 1280
@@ -0,0 +1,46 @@
+"""Tests for threading utilities."""
+
+import threading
+import unittest
+from src.utils.threading import FrameRing
+
+
+class TestFrameRing(unittest.TestCase):
+    """Test the single-producer/single-consumer frame ring."""
+    
+    def test_frames_come_out_in_order(self):
+        """Test that frames are consumed in the order they were published."""
+        ring = FrameRing(capacity=4)
+        for i in range(3):
+            self.assertTrue(ring.put(i, "frame%d" % i, float(i), None))
+        
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.get(timeout=0), (0, "frame0", 0.0, None))
+        self.assertEqual(ring.get(timeout=0), (1, "frame1", 1.0, None))
+        self.assertEqual(ring.get(timeout=0), (2, "frame2", 2.0, None))
+        self.assertIsNone(ring.get(timeout=0.01))
+    
+    def test_full_ring_drops_new_frames(self):
+        """Test that publishing into a full ring is rejected."""
+        ring = FrameRing(capacity=2)
+        self.assertTrue(ring.put(1, "a", 0.0))
+        self.assertTrue(ring.put(2, "b", 0.0))
+        self.assertFalse(ring.put(3, "c", 0.0))
+        
+        self.assertEqual(ring.get(timeout=0)[0], 1)
+        self.assertTrue(ring.put(4, "d", 0.0))
+    
+    def test_consumer_wakes_on_put(self):
+        """Test that a waiting consumer receives a frame published from another thread."""
+        ring = FrameRing(capacity=4)
+        producer = threading.Timer(0.05, ring.put, args=(7, "frame", 1.0, "img"))
+        producer.start()
+        
+        item = ring.get(timeout=2.0)
+        producer.join()
+        
+        self.assertEqual(item, (7, "frame", 1.0, "img"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,9 @@
 
 import unittest
 import time
-from src.cognitive_loop.trajectory import TrajectoryAnalyzer
+from unittest.mock import patch
+import numpy as np
+from src.cognitive_loop.trajectory import TrajectoryAnalyzer, _classify_movement_code
 from src.utils.data_structures import TrackedObject, DetectionPoint
 
 
@@ -76,6 +78,102 @@ class TestTrajectoryAnalyzer(unittest.TestCase):
         description = self.analyzer.analyze_movement(tracked_obj)
         self.assertIn("Passing", description)
 
+    def _moving_object(self, object_id, step_x, step_y, class_name="chair"):
+        """Create a tracked object moving by a fixed step per frame."""
+        tracked_obj = TrackedObject(object_id=object_id)
+        base_time = time.time()
+        for i in range(5):
+            x = 300 + object_id * 100 + i * step_x
+            y = 300 + i * step_y
+            detection = DetectionPoint(
+                frame_id=i,
+                timestamp=base_time + i * 0.033,
+                box=(x, y, x + 50, y + 50),
+                area=2500,
+                center=(x + 25, y + 25),
+                class_name=class_name,
+                confidence=0.9
+            )
+            tracked_obj.add_detection(detection)
+        return tracked_obj
+
+    def test_camera_shake_detected(self):
+        """Test that objects moving together are treated as camera shake."""
+        tracked_objects = {
+            i: self._moving_object(i, 10, 2) for i in range(1, 5)
+        }
+
+        self.assertTrue(self.analyzer._detect_camera_shake(tracked_objects))
+
+    def test_independent_motion_is_not_shake(self):
+        """Test that objects moving in different directions are not shake."""
+        tracked_objects = {
+            1: self._moving_object(1, 10, 0),
+            2: self._moving_object(2, -10, 0),
+            3: self._moving_object(3, 0, 10),
+            4: self._moving_object(4, 0, -10),
+        }
+
+        self.assertFalse(self.analyzer._detect_camera_shake(tracked_objects))
+
+    def test_too_few_objects_is_not_shake(self):
+        """Test that a quiet scene skips shake detection entirely."""
+        tracked_objects = {
+            i: self._moving_object(i, 10, 2) for i in range(1, 4)
+        }
+
+        self.assertFalse(self.analyzer._detect_camera_shake(tracked_objects))
+
+    def test_handheld_object_inside_person_is_skipped(self):
+        """Test that handheld objects held by a person are not described."""
+        person = self._moving_object(1, 0, 0, class_name="person")
+        phone = self._moving_object(1, 0, 0, class_name="cell phone")
+        cup = self._moving_object(5, 0, 0, class_name="cup")
+
+        descriptions = self.analyzer.analyze_all_objects({1: person, 2: phone, 3: cup})
+
+        self.assertEqual(descriptions, ["person: Stationary", "cup: Stationary"])
+
+    def test_features_cached_until_new_detection(self):
+        """Test that trajectory features are recomputed only after new detections."""
+        tracked_obj = self._moving_object(1, 10, 0)
+        engine = self.analyzer.physics_engine
+
+        with patch.object(
+            engine, "calculate_velocity_and_area",
+            wraps=engine.calculate_velocity_and_area
+        ) as calculate:
+            self.analyzer.analyze_all_objects({1: tracked_obj})
+            self.analyzer.analyze_all_objects({1: tracked_obj})
+            self.assertEqual(calculate.call_count, 1)
+
+            latest = tracked_obj.get_latest()
+            tracked_obj.add_detection(DetectionPoint(
+                frame_id=latest.frame_id + 1,
+                timestamp=latest.timestamp + 0.033,
+                box=latest.box,
+                area=latest.area,
+                center=latest.center,
+                class_name=latest.class_name,
+                confidence=0.9
+            ))
+            self.analyzer.analyze_all_objects({1: tracked_obj})
+            self.assertEqual(calculate.call_count, 2)
+
+    def test_classify_batch_matches_scalar_classification(self):
+        """Test vectorized classification against the per-object kernel."""
+        delta_x = np.array([0.0, 3.0, 6.0, 0.0, -8.0, 1.0])
+        delta_y = np.array([0.0, -3.0, 0.0, 1.0, 2.0, 0.0])
+        area_growth = np.array([0.0, 10.0, 5.0, 40.0, -30.0, -26.0])
+        
+        codes = TrajectoryAnalyzer.classify_batch(delta_x, delta_y, area_growth, 5.0, 25.0)
+        
+        expected = [
+            _classify_movement_code(dx, dy, ag, 5.0, 25.0)
+            for dx, dy, ag in zip(delta_x, delta_y, area_growth)
+        ]
+        self.assertEqual(codes.tolist(), expected)
+
 
 if __name__ == '__main__':
     unittest.main()